@@ -1,7 +1,9 @@
 # app/admin.py
+import asyncio
 from sqladmin import Admin, ModelView
 from sqladmin.authentication import AuthenticationBackend
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 import os
 
 from app.db.session import engine, SessionLocal
@@ -15,11 +17,18 @@ from app.models.property_image import PropertyImage
 from app.models.property_report import PropertyReport
 from app.models.refresh_token import RefreshToken
 from app.models.tie_point import TiePoint
-from app.core.security import verify_password
+from app.core.security import run_hashing_async, verify_and_update
+from app.services.overlaps import run_overlap_checks
+from app.services.property_geometry import GEOMETRY_COLUMNS, recompute_detached
 
 ADMIN_ROLE_ID = int(os.getenv("ADMIN_ROLE_ID", "3"))
 
 
+def _recompute_and_check(**ids) -> None:
+    """Blocking: new stored geometry, then fresh overlaps for the properties it changed."""
+    run_overlap_checks(recompute_detached(**ids))
+
+
 # --- Auth backend (no template changes needed) ---
 class AdminAuth(AuthenticationBackend):
     async def login(self, request):
@@ -36,7 +45,11 @@ class AdminAuth(AuthenticationBackend):
                 )
             ).scalar_one_or_none()
 
-            if user and verify_password(password, user.hashed_password):
+            ok, new_hash = await run_hashing_async(verify_and_update, password, user.hashed_password if user else None)
+            if ok:
+                if new_hash:
+                    user.hashed_password = new_hash
+                    db.commit()
                 request.session["authenticated"] = True
                 request.session["admin_user_id"] = user.id
                 return True
@@ -126,6 +139,16 @@ def mount_admin(app):
         column_searchable_list = [TiePoint.tie_point_name, TiePoint.province, TiePoint.municipality]
         column_sortable_list = [TiePoint.id, TiePoint.tie_point_name, TiePoint.province, TiePoint.municipality]
 
+        # Moving a tie point moves every parcel anchored on it
+        async def on_model_change(self, data, model, is_created, request):
+            request.state.tie_point_moved = not is_created and any(
+                k in data and data[k] != getattr(model, k) for k in ("northing", "easting")
+            )
+
+        async def after_model_change(self, data, model, is_created, request):
+            if getattr(request.state, "tie_point_moved", False):
+                await asyncio.to_thread(_recompute_and_check, tie_point_ids=[model.id])
+
     # --- Property ---
     class PropertyAdmin(ModelView, model=Property):
         name = "Property"
@@ -143,7 +166,8 @@ def mount_admin(app):
         ]
         column_searchable_list = [Property.title_number, Property.owner]
         column_sortable_list = [Property.id, Property.created_at, Property.updated_at]
-        form_excluded_columns = ["images", "boundaries", "reports", "user"]
+        # geometry is derived from the tie point + boundaries (recomputed on save), never typed in
+        form_excluded_columns = ["images", "boundaries", "reports", "user", *GEOMETRY_COLUMNS]
         column_details_list = [
             Property.id,
             Property.title_number,
@@ -159,6 +183,21 @@ def mount_admin(app):
             Property.tie_point_id: lambda m, a: f"{m.tie_point_id} ({getattr(m.tie_point, 'tie_point_name', '')})",
         }
 
+        # The formatters above read user/tie_point; load them with the page, not per row
+        def list_query(self, request):
+            return super().list_query(request).options(
+                joinedload(Property.user), joinedload(Property.tie_point)
+            )
+
+        def details_query(self, request):
+            return super().details_query(request).options(
+                joinedload(Property.user), joinedload(Property.tie_point)
+            )
+
+        # The tie point may have been changed: one property, so just recompute
+        async def after_model_change(self, data, model, is_created, request):
+            await asyncio.to_thread(_recompute_and_check, property_ids=[model.id])
+
     # --- PropertyBoundary ---
     class PropertyBoundaryAdmin(ModelView, model=PropertyBoundary):
         name = "Property Boundary"
@@ -174,6 +213,12 @@ def mount_admin(app):
         column_searchable_list = [PropertyBoundary.bearing]
         column_sortable_list = [PropertyBoundary.id, PropertyBoundary.property_id, PropertyBoundary.distance_m]
 
+        async def after_model_change(self, data, model, is_created, request):
+            await asyncio.to_thread(_recompute_and_check, property_ids=[model.property_id])
+
+        async def after_model_delete(self, model, request):
+            await asyncio.to_thread(_recompute_and_check, property_ids=[model.property_id])
+
     # --- PropertyImage ---
     class PropertyImageAdmin(ModelView, model=PropertyImage):
         name = "Property Image"
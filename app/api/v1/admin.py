@@ -1,11 +1,19 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
 
 from app.schemas.user import SetRoleRequest, UserRead
 from app.models.user import User
 from app.models.role import Role
 from app.core.deps import get_db, require_roles, get_current_user
+from app.core.executors import executor_stats
+from app.core.revocation import stats as revocation_stats
+from app.db.session import pool_stats
+from app.services.maintenance import runner as maintenance_runner, table_sizes
+from app.services.outbox import sender as outbox_sender
+from app.services.overlaps import run_overlap_checks
+from app.services.property_geometry import backfill_missing
+from app.services.report_store import prune_unreferenced_blobs
 
 router = APIRouter(
     prefix="/v1/admin",
@@ -49,3 +57,60 @@ def list_users(
         .all()
     )
     return users
+
+
+@router.get("/metrics")
+def runtime_metrics(
+    _: User = Depends(require_roles("admin")),
+):
+    """
+    Per-process runtime counters: worker pools (render time, queue wait, saturation),
+    database connection checkouts (currently held, peak, how long each was held) and
+    outbox deliveries (sent / retried / failed).
+    """
+    return {"executors": executor_stats(), "db_pool": pool_stats.stats(), "outbox": outbox_sender.stats(),
+            "refresh_revocation": revocation_stats()}
+
+
+@router.post("/reports/gc")
+def gc_report_files(
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin")),
+):
+    """Delete stored report PDFs that no PropertyReport row references anymore."""
+    return prune_unreferenced_blobs(db)
+
+
+@router.post("/properties/geometry/backfill")
+def backfill_property_geometry(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin")),
+):
+    """
+    Compute stored polygon/centroid/bbox/area for properties that don't have it yet,
+    then run the overlap check for each of them in the background.
+    """
+    processed = backfill_missing(db)
+    if processed:
+        background_tasks.add_task(run_overlap_checks, processed)
+    return {"processed": len(processed)}
+
+
+@router.get("/maintenance/tables")
+def maintenance_tables(
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin")),
+):
+    """Sizes of the token / code / outbox tables and the last prune (this process)."""
+    return {"tables": table_sizes(db), "last_run": maintenance_runner.last_run}
+
+
+@router.post("/maintenance/prune")
+def maintenance_prune(
+    db: Session = Depends(get_db),
+    _: User = Depends(require_roles("admin")),
+):
+    """Delete expired tokens and codes and old delivered outbox rows now, in small batches."""
+    result = maintenance_runner.run_once()
+    return {**result, "tables": table_sizes(db)}
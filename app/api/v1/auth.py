@@ -2,10 +2,10 @@ from __future__ import annotations
 from datetime import datetime, timezone, timedelta
 import uuid, secrets
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi.responses import RedirectResponse
 
 from app.schemas.user import (
@@ -19,17 +19,19 @@ from app.models.refresh_token import RefreshToken
 from app.models.email_verify_token import EmailVerifyToken
 from app.models.otp_code import OtpCode, OtpPurpose
 from app.core.security import (
-    hash_password, verify_password, create_access_token, create_refresh_token, TokenPayload
+    hash_password, verify_and_update, create_access_token, create_refresh_token, TokenPayload,
+    hash_otp, verify_otp, run_hashing,
 )
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_db_user
+from app.core.principal import Principal
+from app.core.revocation import is_family_revoked, mark_family_revoked
 from app.core.config import (
     SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_COOKIE_NAME, REFRESH_COOKIE_PATH, REFRESH_COOKIE_SAMESITE,
     REFRESH_COOKIE_SECURE, REFRESH_COOKIE_HTTPONLY,
     OTP_LENGTH, OTP_TTL_MINUTES, OTP_MAX_ATTEMPTS, OTP_RESEND_COOLDOWN_SECONDS, APP_FRONTEND_URL, APP_BACKEND_URL
 )
-from app.services.sms import send_sms
-from app.services.email import send_email
+from app.services.outbox import enqueue_email, enqueue_sms
 from app.services.email_templates import build_verification_email
 
 from app.db.session import get_db
@@ -66,14 +68,17 @@ def _create_email_verify_token(db: Session, user: User) -> EmailVerifyToken:
     return row
 
 
-def _send_verification_email(user, token: str):
+def _send_verification_email(db: Session, user, token: str):
+    """Queue the verification email (delivered by the outbox sender) and commit."""
     verify_link = f"{APP_BACKEND_URL}/v1/auth/verify/email?token={token}"
     html = build_verification_email(user.email, verify_link)
-    send_email(
+    enqueue_email(
+        db,
         to=user.email,
         subject="Verify your Land Tracker account",
         html=html
     )
+    db.commit()
 
 
 # ----------------- Cookie helpers -----------------
@@ -99,20 +104,10 @@ def _read_refresh_cookie(req: Request) -> str | None:
 
 
 # ----------------- OTP helpers -----------------
-_otp_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 def _gen_otp_code(length: int = OTP_LENGTH) -> str:
     return "".join(secrets.choice("0123456789") for _ in range(length))
 
 
-def _hash_otp(code: str) -> str:
-    return _otp_ctx.hash(code)
-
-
-def _verify_otp(code: str, code_hash: str) -> bool:
-    return _otp_ctx.verify(code, code_hash)
-
 
 def _create_or_replace_otp(db: Session, user: User) -> OtpCode:
     db.query(OtpCode).filter(
@@ -123,20 +118,20 @@ def _create_or_replace_otp(db: Session, user: User) -> OtpCode:
     code = _gen_otp_code()
     row = OtpCode(
         user_id=user.id,
-        code_hash=_hash_otp(code),
+        code_hash=hash_otp(code),
         purpose=OtpPurpose.REGISTER,
         expires_at=datetime.now(timezone.utc) + timedelta(minutes=OTP_TTL_MINUTES),
         max_attempts=OTP_MAX_ATTEMPTS,
         last_sent_at=datetime.now(timezone.utc),
     )
     db.add(row)
+    enqueue_sms(db, user.mobile, f"Your OTP code is {code}. It expires in {OTP_TTL_MINUTES} minutes.")
     db.commit()
     db.refresh(row)
-    send_sms(user.mobile, f"Your OTP code is {code}. It expires in {OTP_TTL_MINUTES} minutes.")
     return row
 
 
-def _create_change_mobile_otp(db: Session, user: User, new_mobile_norm: str) -> OtpCode:
+def _create_change_mobile_otp(db: Session, user: Principal, new_mobile_norm: str) -> OtpCode:
     # Invalidate older active change_mobile codes
     db.query(OtpCode).filter(
         OtpCode.user_id == user.id,
@@ -147,7 +142,7 @@ def _create_change_mobile_otp(db: Session, user: User, new_mobile_norm: str) ->
     code = _gen_otp_code()
     row = OtpCode(
         user_id=user.id,
-        code_hash=_hash_otp(code),
+        code_hash=hash_otp(code),
         purpose=OtpPurpose.CHANGE_MOBILE,
         expires_at=datetime.now(timezone.utc) + timedelta(minutes=OTP_TTL_MINUTES),
         max_attempts=OTP_MAX_ATTEMPTS,
@@ -155,11 +150,10 @@ def _create_change_mobile_otp(db: Session, user: User, new_mobile_norm: str) ->
         context_mobile=new_mobile_norm,  # bind new target mobile
     )
     db.add(row)
+    # Send OTP to the NEW number
+    enqueue_sms(db, new_mobile_norm, f"Your LandTracker code is {code}. Valid for {OTP_TTL_MINUTES} minutes.")
     db.commit()
     db.refresh(row)
-
-    # Send OTP to the NEW number
-    send_sms(new_mobile_norm, f"Your LandTracker code is {code}. Valid for {OTP_TTL_MINUTES} minutes.")
     return row
 
 
@@ -176,7 +170,8 @@ def _issue_otp_respecting_cooldown(db: Session, user: User) -> None:
     if last and last.last_sent_at and (now - last.last_sent_at).total_seconds() < OTP_RESEND_COOLDOWN_SECONDS:
         # Re-send the same (still-valid) code without rotating it
         # (Optional) You could also choose to silently do nothing.
-        send_sms(user.mobile, f"Your verification code is valid. It expires at {last.expires_at.isoformat()}.")
+        enqueue_sms(db, user.mobile, f"Your verification code is valid. It expires at {last.expires_at.isoformat()}.")
+        db.commit()
         return
 
     # Otherwise, rotate (invalidate old) and send a brand-new code
@@ -215,7 +210,7 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
     user = User(
         email=payload.email,
         mobile=mobile_norm,
-        hashed_password=hash_password(payload.password),
+        hashed_password=run_hashing(hash_password, payload.password),
         first_name=payload.first_name,
         last_name=payload.last_name,
         role_id=role.id,
@@ -226,7 +221,7 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
     db.refresh(user)
 
     tok = _create_email_verify_token(db, user)
-    _send_verification_email(user, tok.token)
+    _send_verification_email(db, user, tok.token)
     return user
 
 
@@ -240,7 +235,7 @@ def email_verify_request(body: EmailVerifyRequest, db: Session = Depends(get_db)
         return OtpStatus(ok=True, message="Already verified")
 
     tok = _create_email_verify_token(db, user)
-    _send_verification_email(user, tok.token)
+    _send_verification_email(db, user, tok.token)
     return OtpStatus(ok=True, message="Verification email sent")
 
 
@@ -320,7 +315,7 @@ def confirm_verification(body: OtpConfirm, db: Session = Depends(get_db)):
         db.commit()
         raise HTTPException(status_code=400, detail="Too many attempts")
 
-    ok = _verify_otp(body.code, row.code_hash)
+    ok = verify_otp(body.code, row.code_hash)
     row.attempts_used += 1
     if ok:
         row.is_used = True
@@ -337,7 +332,7 @@ def confirm_verification(body: OtpConfirm, db: Session = Depends(get_db)):
 def request_change_mobile(
     body: MobileChangeRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     new_mobile_norm = normalize_ph_mobile(body.new_mobile)
 
@@ -368,7 +363,7 @@ def request_change_mobile(
 def confirm_change_mobile(
     body: MobileChangeConfirm,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_db_user),
 ):
     new_mobile_norm = normalize_ph_mobile(body.new_mobile)
 
@@ -397,7 +392,7 @@ def confirm_change_mobile(
         db.commit()
         raise HTTPException(status_code=400, detail="Too many attempts")
 
-    ok = _verify_otp(body.code, row.code_hash)
+    ok = verify_otp(body.code, row.code_hash)
     row.attempts_used += 1
 
     if not ok:
@@ -430,13 +425,16 @@ def login(payload: UserLogin, response: Response, request: Request, db: Session
     print(payload)
     email = payload.email
     user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    ok, new_hash = run_hashing(verify_and_update, payload.password, user.hashed_password if user else None)
+    if not ok:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        user.hashed_password = new_hash  # cost settings changed: upgrade in place (committed with this request)
 
     if not user.is_verified:
         # issue (or rotate) email token and tell client to check email
         tok = _create_email_verify_token(db, user)
-        _send_verification_email(user, tok.token)
+        _send_verification_email(db, user, tok.token)
         raise HTTPException(
             status_code=403,
             detail={
@@ -451,10 +449,12 @@ def login(payload: UserLogin, response: Response, request: Request, db: Session
 
     access = create_access_token(user.id, role_name)
     jti = uuid.uuid4().hex
-    refresh = create_refresh_token(user.id, role_name, jti=jti)
+    family_id = uuid.uuid4().hex  # a new family per login; rotations inherit it
+    refresh = create_refresh_token(user.id, role_name, jti=jti, family_id=family_id)
 
     rt = RefreshToken(
         jti=jti,
+        family_id=family_id,
         user_id=user.id,
         is_revoked=False,
         expires_at=datetime.now(timezone.utc) + timedelta(days=7),
@@ -473,6 +473,27 @@ def login(payload: UserLogin, response: Response, request: Request, db: Session
     )
 
 
+def _revoke_on_reuse(db: Session, data: TokenPayload, now: datetime) -> None:
+    """
+    A refresh token that was already rotated (or revoked) came back: whoever holds the
+    family is suspect, so revoke every token in it (all of the user's, for pre-family tokens).
+    """
+    reused = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.jti == data.jti)
+        .values(reused_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    ).first()
+    if reused is None:
+        db.rollback()  # unknown jti (e.g. pruned): nothing to revoke
+        return
+    scope = RefreshToken.family_id == reused.family_id if reused.family_id else RefreshToken.user_id == reused.user_id
+    db.execute(update(RefreshToken).where(scope, RefreshToken.is_revoked == False).values(is_revoked=True))
+    db.commit()
+    if reused.family_id:
+        mark_family_revoked(reused.family_id)
+
+
 @router.post("/refresh", response_model=TokenPair)
 def refresh_token(request: Request, response: Response, db: Session = Depends(get_db)):
     cookie = _read_refresh_cookie(request)
@@ -488,31 +509,39 @@ def refresh_token(request: Request, response: Response, db: Session = Depends(ge
     if data.type != "refresh":
         raise HTTPException(status_code=401, detail="Refresh token required")
 
-    token_row: RefreshToken | None = db.query(RefreshToken).filter(RefreshToken.jti == data.jti).first()
-    if not token_row or token_row.is_revoked:
-        if token_row:
-            token_row.reused_at = datetime.now(timezone.utc)
-            db.commit()
+    if is_family_revoked(data.fam):
         raise HTTPException(status_code=401, detail="Refresh token revoked or unknown")
 
-    token_row.is_revoked = True
-    token_row.rotated_at = datetime.now(timezone.utc)
+    # Rotate in one statement: only a live token matches, so two concurrent uses can't both win
+    now = datetime.now(timezone.utc)
+    rotated = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.jti == data.jti, RefreshToken.is_revoked == False)
+        .values(is_revoked=True, rotated_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    ).first()
+    if rotated is None:
+        _revoke_on_reuse(db, data, now)
+        raise HTTPException(status_code=401, detail="Refresh token revoked or unknown")
 
-    user = db.get(User, int(data.sub))
-    if not user or not user.is_active:
+    row = db.execute(
+        select(User.is_active, Role.name).outerjoin(Role, Role.id == User.role_id).where(User.id == rotated.user_id)
+    ).first()
+    if not row or not row.is_active:
         db.rollback()
         raise HTTPException(status_code=401, detail="Inactive or missing user")
 
-    # ★ Use role name string again
-    role_name = _user_role_name(user)
+    role_name = row.name or "client"
+    family_id = rotated.family_id or uuid.uuid4().hex  # tokens from before families start one now
 
     new_jti = uuid.uuid4().hex
-    new_refresh = create_refresh_token(user.id, role_name, jti=new_jti)
+    new_refresh = create_refresh_token(rotated.user_id, role_name, jti=new_jti, family_id=family_id)
     new_row = RefreshToken(
         jti=new_jti,
-        user_id=user.id,
+        family_id=family_id,
+        user_id=rotated.user_id,
         is_revoked=False,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        expires_at=now + timedelta(days=7),
         user_agent=request.headers.get("user-agent"),
         ip_addr=request.client.host if request.client else None,
     )
@@ -521,7 +550,7 @@ def refresh_token(request: Request, response: Response, db: Session = Depends(ge
 
     _set_refresh_cookie(response, new_refresh, new_row.expires_at)
 
-    access = create_access_token(user.id, role_name)
+    access = create_access_token(rotated.user_id, role_name)
     return TokenPair(access_token=access, refresh_token="", expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 
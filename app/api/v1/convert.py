@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
-from pyproj import Transformer
 from app.schemas.geometry import NERequest, LonLatResponse
 from app.core.deps import get_current_user
+from app.services.geodesy import prs92_zone3_to_wgs84
 
 router = APIRouter(prefix="/v1/convert", tags=["Convert"], dependencies=[Depends(get_current_user)])
 
@@ -9,6 +9,5 @@ router = APIRouter(prefix="/v1/convert", tags=["Convert"], dependencies=[Depends
 @router.post("/prs92-zone3", response_model=LonLatResponse)
 def convert_prs92_zone3(req: NERequest):
     # PRS92 / Philippines zone 3 -> WGS84
-    transformer = Transformer.from_crs("EPSG:3123", "EPSG:4326", always_xy=True)
-    lon, lat = transformer.transform(req.easting, req.northing)
+    lon, lat = prs92_zone3_to_wgs84().transform(req.easting, req.northing)
     return LonLatResponse(lon=lon, lat=lat)
@@ -1,26 +1,39 @@
 from __future__ import annotations
 import os
-import re
-import uuid
-import base64
-from typing import List
+import asyncio
+from functools import partial
+from typing import Callable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session, selectinload, joinedload
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.config import settings
 from app.core.deps import get_current_user
+from app.core.executors import file_io_executor, image_executor, ExecutorSaturated
+from app.db import load_profiles
+from app.db.load_profiles import load_property
 from app.db.session import get_db
+from app.services.derivatives import derivative_path, generate_derivatives, is_fresh, schedule_derivatives
+from app.services.exports import FORMATS as EXPORT_FORMATS, export_stream
+from app.services.file_serving import serve_file
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.parsing import parse_bearing
+from app.services.overlaps import refresh_overlaps, run_overlap_check
+from app.services.property_geometry import apply_geometry, bbox_intersects
+from app.services.storage import save_data_url, save_stream, UploadRejected
 
 from app.models.property import Property
 from app.models.property_image import PropertyImage
 from app.models.property_boundary import PropertyBoundary
 from app.models.property_report import PropertyReport  # ensure this model file exists
+from app.models.property_overlap import PropertyOverlap
 
 from app.schemas.property import (
-    PropertyCreate, PropertyOut,
-    TitleImageCreate, BoundaryCreate, ReportCreate, ReportOut
+    PropertyCreate, PropertyOut, PropertyPage, PropertySummaryOut,
+    TitleImageCreate, BoundaryCreate, ReportCreate, ReportOut, OverlapOut
 )
 
 router = APIRouter(
@@ -33,57 +46,106 @@ router = APIRouter(
 TITLE_IMG_DIR = settings.title_img_dir               # e.g., /data/uploads/properties
 REPORT_DIR = getattr(settings, "report_dir", None) or os.path.join(os.path.dirname(TITLE_IMG_DIR), "reports")
 
-# --- Helpers ---
-DATA_URL_RE = re.compile(r"^data:(?P<mime>[\w\-\./\+]+);base64,(?P<b64>.+)$", re.I)
-
-
-def _ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
-
+IMAGE_MIMES = {"image/png", "image/jpeg", "image/jpg", "image/webp"}
+REPORT_MIMES = {"application/pdf"}
 
+# --- Helpers ---
 def _save_data_url_strict(data_url: str, base_dir: str, subdir: str, *, allowed_mimes: set[str], filename_hint: str | None = None) -> str:
-    m = DATA_URL_RE.match(data_url or "")
-    if not m:
-        raise HTTPException(status_code=422, detail="Invalid data URL")
-    mime = (m.group("mime") or "").lower()
-    if mime not in {x.lower() for x in allowed_mimes}:
-        raise HTTPException(status_code=422, detail=f"Unsupported MIME type: {mime}")
+    folder = os.path.join(base_dir, subdir) if subdir else base_dir
     try:
-        blob = base64.b64decode(m.group("b64"))
-    except Exception:
-        raise HTTPException(status_code=422, detail="Invalid base64 payload")
+        return save_data_url(data_url, folder, allowed_mimes=allowed_mimes, filename=filename_hint)
+    except UploadRejected as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-    ext_map = {
-        "image/png": ".png",
-        "image/jpeg": ".jpg",
-        "image/jpg": ".jpg",
-        "image/webp": ".webp",
-        "application/pdf": ".pdf",
-    }
-    ext = ext_map.get(mime, ".bin")
 
+def _save_upload_strict(upload: UploadFile, base_dir: str, subdir: str, *, allowed_mimes: set[str]) -> str:
     folder = os.path.join(base_dir, subdir) if subdir else base_dir
-    _ensure_dir(folder)
-    fname = (filename_hint if filename_hint else f"{uuid.uuid4().hex}{ext}")
-    fpath = os.path.join(folder, fname)
-    with open(fpath, "wb") as fh:
-        fh.write(blob)
-    return fpath
-
-
-def _load_full_property(db: Session, prop_id: int) -> Property:
-    prop = db.get(
-        Property,
-        prop_id,
-        options=(
-            selectinload(Property.images),
-            selectinload(Property.boundaries),
-            selectinload(Property.reports),
-            joinedload(Property.tie_point),
-        ),
-    )
-    if not prop:
-        raise HTTPException(status_code=404, detail="Property not found")
+    try:
+        return save_stream(upload.file, folder, allowed_mimes=allowed_mimes)
+    except UploadRejected as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _remove_files(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def _persist_files(jobs: List[Callable[[], str]]) -> List[str]:
+    """
+    Run file-save jobs in parallel on the file I/O pool, at most
+    FILE_WRITE_CONCURRENCY at a time per request. All-or-nothing: if any job
+    fails, every file already written is removed and the first error is raised.
+    Returns the saved paths in job order.
+    """
+    gate = asyncio.Semaphore(settings.file_write_concurrency)
+
+    async def _one(job: Callable[[], str]) -> str:
+        async with gate:
+            return await file_io_executor.run(job)
+
+    results = await asyncio.gather(*(_one(job) for job in jobs), return_exceptions=True)
+    saved = [r for r in results if isinstance(r, str)]
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        await asyncio.to_thread(_remove_files, saved)
+        err = errors[0]
+        if isinstance(err, ExecutorSaturated):
+            raise HTTPException(
+                status_code=429,
+                detail="Upload workers are busy, please retry shortly",
+                headers={"Retry-After": str(err.retry_after)},
+            )
+        raise err
+    return saved
+
+
+def _property_out(prop: Property) -> PropertyOut:
+    """
+    PropertyOut from the in-session object. Call after a flush (ids and server
+    defaults come back via RETURNING) and before commit, which would expire it.
+    """
+    out = PropertyOut.model_validate(prop, from_attributes=True)
+    # Appended children sit at the end of the loaded collections; match the relationship order_by
+    out.images.sort(key=lambda i: (i.order_index, i.id))
+    out.boundaries.sort(key=lambda b: b.id)
+    out.reports.sort(key=lambda r: (r.created_at, r.id), reverse=True)
+    return out
+
+
+def _commit_and_respond(db: Session, prop: Property, saved_paths: List[str] = ()) -> PropertyOut:
+    """Flush, build the response, commit; if any of it fails, don't leave orphaned files behind."""
+    try:
+        db.flush()
+        out = _property_out(prop)
+        db.commit()
+    except Exception:
+        db.rollback()
+        _remove_files(list(saved_paths))
+        raise
+    return out
+
+
+def _boundary_row(property_id: int, b: BoundaryCreate) -> dict:
+    """Insert params for one boundary; bearing components come from the client or are parsed once here."""
+    row = {"property_id": property_id, "bearing": b.bearing, "distance_m": b.distance_m}
+    if b.ns and b.degrees is not None and b.minutes is not None:
+        parts = {"ns": b.ns.upper(), "degrees": b.degrees, "minutes": b.minutes,
+                 "seconds": b.seconds, "ew": b.ew.upper() if b.ew else None}
+    else:
+        parsed = parse_bearing(b.bearing) or {}
+        parts = {k: parsed.get(k) for k in ("ns", "degrees", "minutes", "seconds", "ew")}
+    row.update(parts)
+    return row
+
+
+def _owned_property(db: Session, property_id: int, user, profile: tuple = load_profiles.OWNERSHIP) -> Property:
+    prop = load_property(db, property_id, profile)
+    if prop.user_id != user.id:
+        raise HTTPException(status_code=403, detail="Not your property")
     return prop
 
 
@@ -93,24 +155,120 @@ def _load_full_property(db: Session, prop_id: int) -> Property:
 def list_my_properties(db: Session = Depends(get_db), user=Depends(get_current_user)):
     return (
         db.query(Property)
-        .options(
-            selectinload(Property.images),
-            selectinload(Property.boundaries),
-            selectinload(Property.reports),
-            joinedload(Property.tie_point),
-        )
+        .options(*load_profiles.FULL)
         .filter(Property.user_id == user.id)
         .order_by(Property.created_at.desc())
         .all()
     )
 
 
+def _parse_includes(include: Optional[str]) -> list[str]:
+    names = [x.strip() for x in (include or "").split(",") if x.strip()]
+    unknown = sorted(set(names) - set(load_profiles.SUMMARY_INCLUDES))
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown include: {', '.join(unknown)} (allowed: {', '.join(sorted(load_profiles.SUMMARY_INCLUDES))})",
+        )
+    return list(dict.fromkeys(names))
+
+
+def _parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    try:
+        west, south, east, north = (float(x) for x in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    if west > east or south > north:
+        raise HTTPException(status_code=422, detail="bbox min must not exceed max")
+    return west, south, east, north
+
+
+def _summary_page(db: Session, stmt, *, limit: int, cursor: Optional[str], includes: list[str]) -> PropertyPage:
+    """Run a Property select as one newest-first keyset page (created_at, id) of summary items."""
+    stmt = (
+        stmt.options(*load_profiles.summary(includes))
+        .order_by(Property.created_at.desc(), Property.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Property.created_at, Property.id) < tuple_(created_at, last_id))
+
+    rows = db.execute(stmt).scalars().all()
+    page, more = rows[:limit], len(rows) > limit
+
+    items = []
+    for prop in page:
+        data = {col.key: getattr(prop, col.key) for col in load_profiles.SUMMARY_COLUMNS}
+        for name in includes:
+            data[name] = getattr(prop, name)
+        items.append(PropertySummaryOut.model_validate(data, from_attributes=True))
+
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if more else None
+    return PropertyPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/my/page", response_model=PropertyPage, response_model_exclude_none=True)
+def page_my_properties(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include: Optional[str] = Query(None, description="Comma-separated: geometry,images,boundaries,reports"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Newest-first listing, keyset-paginated on (created_at, id) so deep pages cost the
+    same as the first one. Returns a summary projection; child rows only when included.
+    """
+    stmt = select(Property).where(Property.user_id == user.id)
+    return _summary_page(db, stmt, limit=limit, cursor=cursor, includes=_parse_includes(include))
+
+
+@router.get("/in-bbox", response_model=PropertyPage, response_model_exclude_none=True)
+def properties_in_bbox(
+    bbox: str = Query(..., description="Viewport as min_lon,min_lat,max_lon,max_lat (WGS84)"),
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include: Optional[str] = Query(None, description="Comma-separated: images,boundaries,reports"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    The user's properties whose stored bbox intersects the viewport, with their geometry.
+    Same keyset paging as /my/page. Properties without stored geometry never match.
+    """
+    west, south, east, north = _parse_bbox(bbox)
+    includes = list(dict.fromkeys(["geometry", *_parse_includes(include)]))
+    stmt = select(Property).where(
+        Property.user_id == user.id,
+        bbox_intersects(db.get_bind().dialect.name, west, south, east, north),
+    )
+    return _summary_page(db, stmt, limit=limit, cursor=cursor, includes=includes)
+
+
+@router.get("/my/export", response_class=StreamingResponse)
+def export_my_properties(
+    format: str = Query("geojson", description="geojson, kml or shp (zipped Shapefile)"),
+    bbox: Optional[str] = Query(None, description="Optional filter: min_lon,min_lat,max_lon,max_lat (WGS84)"),
+    user=Depends(get_current_user),
+):
+    """
+    The user's parcel polygons (WGS84) as a GeoJSON FeatureCollection, a KML document or
+    a zipped Shapefile, streamed in id order. Properties without stored geometry are left out.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    media_type, ext = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        export_stream(format, user.id, _parse_bbox(bbox) if bbox else None),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="properties.{ext}"'},
+    )
+
+
 @router.get("/{property_id}", response_model=PropertyOut)
 def get_property(property_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    prop = _load_full_property(db, property_id)
-    if prop.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not your property")
-    return prop
+    return _owned_property(db, property_id, user, load_profiles.FULL)
 
 
 @router.post("", response_model=PropertyOut)
@@ -129,40 +287,44 @@ async def create_property(
         owner=payload.owner,
         technical_description=payload.technical_description,
         tie_point_id=payload.tie_point_id,
+        images=[], boundaries=[], reports=[],  # known empty: no lazy load when building the response
     )
     db.add(prop)
-    db.commit()
-    db.refresh(prop)
-    return _load_full_property(db, prop.id)
+    return _commit_and_respond(db, prop)
 
 
 @router.put("/{property_id}/boundaries", response_model=PropertyOut)
 async def replace_boundaries(
     property_id: int,
     boundaries: List[BoundaryCreate],
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    prop = _load_full_property(db, property_id)
-    if prop.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not your property")
-
-    # Replace-all semantics
-    # Clear existing
-    for b in list(prop.boundaries):
-        db.delete(b)
-    db.flush()
+    prop = _owned_property(
+        db, property_id, user,
+        (*load_profiles.full(without=("boundaries",)), joinedload(Property.tie_point)),
+    )
 
-    # Insert new
-    for b in boundaries or []:
-        db.add(PropertyBoundary(
-            property_id=prop.id,
-            bearing=b.bearing,
-            distance_m=b.distance_m,
-        ))
+    # Replace-all semantics, set-based: one DELETE, one multi-row INSERT ... RETURNING
+    # (batched by SQLAlchemy's insertmanyvalues), same transaction. Rows must come back in
+    # input order: the traverse (polygon, area, bbox) walks the legs in that order.
+    db.execute(
+        delete(PropertyBoundary).where(PropertyBoundary.property_id == prop.id),
+        execution_options={"synchronize_session": False},
+    )
+    rows = [_boundary_row(prop.id, b) for b in boundaries or []]
+    new_boundaries = db.scalars(
+        insert(PropertyBoundary).returning(PropertyBoundary, sort_by_parameter_order=True), rows
+    ).all() if rows else []
+    # Hand the inserted rows to the collection as already-loaded state (no lazy load, no flush work)
+    set_committed_value(prop, "boundaries", new_boundaries)
+    apply_geometry(prop, prop.tie_point, new_boundaries)
 
-    db.commit()
-    return _load_full_property(db, prop.id)
+    out = _commit_and_respond(db, prop)
+    # New shape -> re-check overlaps with the owner's other parcels after the response is sent
+    background_tasks.add_task(run_overlap_check, out.id)
+    return out
 
 
 @router.post("/{property_id}/images", response_model=PropertyOut)
@@ -172,30 +334,29 @@ async def add_images(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    prop = _load_full_property(db, property_id)
-    if prop.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not your property")
+    prop = _owned_property(db, property_id, user, load_profiles.FULL)
 
-    # Reject PDFs; allow image/* only
-    allowed = {"image/png", "image/jpeg", "image/jpg", "image/webp"}
-    for img in images or []:
-        # Save file
-        saved_path = _save_data_url_strict(
+    images = images or []
+    # Decode + write every image in parallel off the event loop; reject PDFs, allow image/* only
+    saved_paths = await _persist_files([
+        partial(
+            _save_data_url_strict,
             img.data_url,
             base_dir=TITLE_IMG_DIR,
             subdir=str(user.id),
-            allowed_mimes=allowed,
+            allowed_mimes=IMAGE_MIMES,
             filename_hint=None,  # derive from MIME; you can pass a client filename if you add it later
         )
-        # Store DB row
-        db.add(PropertyImage(
-            property_id=prop.id,
-            file_path=saved_path,
-            order_index=img.order_index,
-        ))
+        for img in images
+    ])
+
+    # Store DB rows only once every file is on disk
+    for img, saved_path in zip(images, saved_paths):
+        prop.images.append(PropertyImage(file_path=saved_path, order_index=img.order_index))
 
-    db.commit()
-    return _load_full_property(db, prop.id)
+    out = _commit_and_respond(db, prop, saved_paths)
+    schedule_derivatives(saved_paths)
+    return out
 
 
 @router.post("/{property_id}/reports", response_model=PropertyOut)
@@ -205,35 +366,108 @@ async def add_reports(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    prop = _load_full_property(db, property_id)
-    if prop.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not your property")
+    prop = _owned_property(db, property_id, user, load_profiles.FULL)
 
+    reports = reports or []
     # PDFs only
-    allowed = {"application/pdf"}
-    for rpt in reports or []:
-        saved_path = _save_data_url_strict(
+    saved_paths = await _persist_files([
+        partial(
+            _save_data_url_strict,
             rpt.data_url,
             base_dir=REPORT_DIR,
             subdir=str(user.id),
-            allowed_mimes=allowed,
+            allowed_mimes=REPORT_MIMES,
             filename_hint=None,  # can accept a filename in schema later if desired
         )
-        db.add(PropertyReport(
-            property_id=prop.id,
-            report_type=rpt.report_type,
-            file_path=saved_path,
-        ))
+        for rpt in reports
+    ])
+
+    for rpt, saved_path in zip(reports, saved_paths):
+        prop.reports.append(PropertyReport(report_type=rpt.report_type, file_path=saved_path))
+
+    return _commit_and_respond(db, prop, saved_paths)
+
+
+@router.post("/{property_id}/images/upload", response_model=PropertyOut)
+async def upload_images(
+    property_id: int,
+    files: List[UploadFile] = File(...),
+    order_index: List[int] = Form(...),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Multipart alternative to POST /images: raw image files + one order_index per file."""
+    prop = _owned_property(db, property_id, user, load_profiles.FULL)
+    if len(files) != len(order_index):
+        raise HTTPException(status_code=422, detail="Provide one order_index per file")
+
+    saved_paths = await _persist_files([
+        partial(_save_upload_strict, upload, TITLE_IMG_DIR, str(user.id), allowed_mimes=IMAGE_MIMES)
+        for upload in files
+    ])
+
+    for idx, saved_path in zip(order_index, saved_paths):
+        prop.images.append(PropertyImage(file_path=saved_path, order_index=idx))
+
+    out = _commit_and_respond(db, prop, saved_paths)
+    schedule_derivatives(saved_paths)
+    return out
+
+
+@router.post("/{property_id}/reports/upload", response_model=PropertyOut)
+async def upload_reports(
+    property_id: int,
+    files: List[UploadFile] = File(...),
+    report_type: str = Form(...),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Multipart alternative to POST /reports: raw PDF files sharing one report_type."""
+    prop = _owned_property(db, property_id, user, load_profiles.FULL)
+
+    saved_paths = await _persist_files([
+        partial(_save_upload_strict, upload, REPORT_DIR, str(user.id), allowed_mimes=REPORT_MIMES)
+        for upload in files
+    ])
+
+    for saved_path in saved_paths:
+        prop.reports.append(PropertyReport(report_type=report_type, file_path=saved_path))
+
+    return _commit_and_respond(db, prop, saved_paths)
+
+
+@router.get("/{property_id}/overlaps", response_model=List[OverlapOut])
+def list_overlaps(property_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Overlaps found by the last check (runs automatically after PUT /boundaries)."""
+    _owned_property(db, property_id, user)
+    rows = db.execute(
+        select(PropertyOverlap, Property.title_number)
+        .join(Property, Property.id == PropertyOverlap.other_property_id)
+        .where(PropertyOverlap.property_id == property_id)
+        .order_by(PropertyOverlap.overlap_area_m2.desc())
+    ).all()
+    return [
+        OverlapOut(
+            other_property_id=o.other_property_id,
+            other_title_number=title,
+            overlap_area_m2=o.overlap_area_m2,
+            overlap_ratio=o.overlap_ratio,
+        )
+        for o, title in rows
+    ]
+
 
-    db.commit()
-    return _load_full_property(db, prop.id)
+@router.post("/{property_id}/overlaps/check", response_model=List[OverlapOut])
+def check_overlaps(property_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Run the overlap check now and return (and store) the result."""
+    _owned_property(db, property_id, user)
+    found = refresh_overlaps(db, property_id)
+    return sorted(found, key=lambda o: o["overlap_area_m2"], reverse=True)
 
 
 @router.get("/{property_id}/reports", response_model=List[ReportOut])
 def list_property_reports(property_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    prop = _load_full_property(db, property_id)
-    if prop.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not your property")
+    prop = _owned_property(db, property_id, user)
     return sorted(prop.reports, key=lambda r: (r.created_at, r.id), reverse=True)
 
 
@@ -241,15 +475,12 @@ def list_property_reports(property_id: int, db: Session = Depends(get_db), user=
 def download_report(
     property_id: int,
     report_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
     # Verify property ownership
-    prop = db.get(Property, property_id)
-    if not prop:
-        raise HTTPException(status_code=404, detail="Property not found")
-    if prop.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not your property")
+    _owned_property(db, property_id, user)
 
     rpt = (
         db.query(PropertyReport)
@@ -267,8 +498,80 @@ def download_report(
         raise HTTPException(status_code=404, detail="Report file missing")
 
     # Let browser display inline, but still downloadable
-    return FileResponse(
-        path=fpath,
-        media_type="application/pdf",
-        filename=os.path.basename(fpath),
+    # Content-addressed blobs are named by hash; give the client a readable name instead
+    filename = f"LandTracker_Report_p{property_id}_{report_id}.pdf" if rpt.content_hash else None
+    return serve_file(request, fpath, media_type="application/pdf", filename=filename)
+
+
+def _owned_image(db: Session, property_id: int, image_id: int, user) -> PropertyImage:
+    # Verify property ownership
+    _owned_property(db, property_id, user)
+
+    img = (
+        db.query(PropertyImage)
+        .filter(
+            PropertyImage.id == image_id,
+            PropertyImage.property_id == property_id,
+        )
+        .first()
     )
+    if not img:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    if not img.file_path or not os.path.exists(img.file_path):
+        raise HTTPException(status_code=404, detail="Image file missing")
+    return img
+
+
+def _serve_derivative(request: Request, img: PropertyImage, variant: str):
+    """Sync (threadpool) handler helper: generation still runs on the bounded image pool."""
+    path = derivative_path(img.file_path, variant)
+    if not is_fresh(img.file_path, path):
+        # Stored before derivatives existed, skipped under load, or the original was replaced: build now
+        try:
+            image_executor.submit(generate_derivatives, img.file_path).result()
+        except ExecutorSaturated as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Image workers are busy, please retry shortly",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except OSError:
+            raise HTTPException(status_code=422, detail="Image could not be decoded")
+    return serve_file(request, path, media_type="image/webp")
+
+
+@router.get("/{property_id}/images/{image_id}/download")
+def download_image(
+    property_id: int,
+    image_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    img = _owned_image(db, property_id, image_id, user)
+    return serve_file(request, img.file_path)
+
+
+@router.get("/{property_id}/images/{image_id}/thumbnail")
+def image_thumbnail(
+    property_id: int,
+    image_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    img = _owned_image(db, property_id, image_id, user)
+    return _serve_derivative(request, img, "thumb")
+
+
+@router.get("/{property_id}/images/{image_id}/preview")
+def image_preview(
+    property_id: int,
+    image_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    img = _owned_image(db, property_id, image_id, user)
+    return _serve_derivative(request, img, "medium")
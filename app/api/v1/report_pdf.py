@@ -1,30 +1,36 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
+from fastapi.responses import StreamingResponse, FileResponse
 from urllib.parse import urlsplit
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-import io, httpx, os
-from datetime import datetime
-from reportlab.pdfgen import canvas
+from cachetools import TTLCache
+import asyncio, io, httpx, os, zipfile
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
-from reportlab.platypus import Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, Paragraph, Spacer, Image, CondPageBreak, PageBreak
 from xml.sax.saxutils import escape
 from app.core.deps import get_current_user
 from app.core.config import settings
-from app.schemas.report_pdf import ReportData
-from app.db.session import get_db
+from app.core.executors import report_executor, ExecutorSaturated
+from app.schemas.report_pdf import ReportData, BatchReportRequest
+from app.services.exports import ZipSink
+from app.services.parsing import parse_bearing
+from app.services.report_store import report_key, combined_key, blob_path, write_blob, find_existing, find_existing_many
+from app.services.report_template import ReportTemplate, get_report_template, MARGIN
+from app.db.session import get_db, SessionLocal
 from app.models.property_report import PropertyReport
+from app.db import load_profiles
 from app.models.property import Property  # to verify ownership
 
 router = APIRouter(prefix="/v1/report_pdf", tags=["reports"], dependencies=[Depends(get_current_user)])
 
-# ---------- logo config ----------
-LOGO_MAX_H = 55  # points
-LOGO_MAX_W = 72  # points (to prevent super-wide logos)
-LOGO_PATH = settings.lt_logo_path
 REPORTS_DIR = settings.reports_dir
+SNAPSHOT_MAX_H_RATIO = 0.55  # of the frame height
+BOUNDARY_HEADER_H = 20  # points
+BOUNDARY_ROW_H = 16     # points (single line of 10pt text + padding)
+
+# Static Maps images keyed by URL; identical snapshots (re-renders, batches) skip the upstream fetch.
+_SNAPSHOT_CACHE: TTLCache = TTLCache(maxsize=settings.snapshot_cache_size, ttl=settings.snapshot_cache_ttl_seconds)
 
 
 def _ensure_dir(p: str) -> None:
@@ -32,17 +38,10 @@ def _ensure_dir(p: str) -> None:
 
 
 # ---------- helpers ----------
-def _hr(c: canvas.Canvas, page_w: float, y: float, *, margin: int = 28,
-        thickness: float = 1, color=colors.HexColor("#CFCFCF")) -> None:
-    """Draw a horizontal rule across the content width at y."""
-    c.saveState()
-    c.setStrokeColor(color)
-    c.setLineWidth(thickness)
-    c.line(margin, y, page_w - margin, y)
-    c.restoreState()
-
-
 async def _fetch_image_bytes(url: str) -> bytes:
+    cached = _SNAPSHOT_CACHE.get(url)
+    if cached is not None:
+        return cached
     sp = urlsplit(url)
     if sp.scheme != "https" or sp.netloc != "maps.googleapis.com" or not sp.path.startswith("/maps/api/staticmap"):
         raise HTTPException(status_code=400, detail="Invalid snapshot host")
@@ -51,167 +50,162 @@ async def _fetch_image_bytes(url: str) -> bytes:
         r = await client.get(url)
     if r.status_code != 200 or not r.content:
         raise HTTPException(status_code=502, detail=f"Static Maps upstream error ({r.status_code})")
+    _SNAPSHOT_CACHE[url] = r.content
     return r.content
 
 
-def _try_load_logo() -> ImageReader | None:
+def _snapshot_flowables(tpl: ReportTemplate, payload: ReportData, img_bytes: bytes | None, avail_w: float) -> list:
+    """
+    Snapshot scaled to the content width, capped at SNAPSHOT_MAX_H_RATIO of the frame,
+    so it stays readable no matter how long the boundaries table gets (the table
+    simply flows onto the next pages).
+    """
+    if not payload.snapshot:
+        return []
     try:
-        if LOGO_PATH and os.path.exists(LOGO_PATH):
-            return ImageReader(LOGO_PATH)
-    except FileNotFoundError:
-        pass
-    return None
+        if img_bytes is None:
+            raise ValueError("snapshot unavailable")
+        iw, ih = ImageReader(io.BytesIO(img_bytes)).getSize()
+        max_h = tpl.frame_h * SNAPSHOT_MAX_H_RATIO
+        scale = min(avail_w / iw, max_h / ih)
+        img = Image(io.BytesIO(img_bytes), width=max(1, iw * scale), height=max(1, ih * scale))
+        return [img, Spacer(1, 15)]
+    except Exception:
+        return [Paragraph("Snapshot could not be embedded.", tpl.note_style), Spacer(1, 14)]
 
 
-def _draw_header(c: canvas.Canvas, page_w: float, page_h: float) -> float:
-    """
-    Draw header with (optional) logo on the left and text on the right.
-    Returns the y-position just below the header separator.
-    """
-    margin_left = 28
-    # Header band height and vertical positioning
-    band_top = page_h - 28
-    band_bottom = page_h - 70
-    band_h = band_top - band_bottom
-    center_y = band_bottom + band_h / 2
-
-    # Try load logo
-    logo = _try_load_logo()
-    text_x = margin_left  # will shift if logo exists
-
-    if logo:
-        iw, ih = logo.getSize()
-        scale = min(LOGO_MAX_W / iw, LOGO_MAX_H / ih)
-        w = max(1, iw * scale)
-        h = max(1, ih * scale)
-        x = margin_left
-        y = center_y - (h / 2)
-        c.drawImage(logo, x, y, width=w, height=h, preserveAspectRatio=True, mask='auto')
-        text_x = x + w + 15  # gap to the right of the logo
-
-    # Title and generated timestamp
-    c.setFont("Helvetica-Bold", 16)
-    # baseline ~ a bit above center
-    title_y = center_y + 3
-    c.drawString(text_x, title_y, "LAND TRACKER SUMMARY REPORT")
-
-    c.setFont("Helvetica", 9)
-    from datetime import datetime
-    c.drawString(text_x, title_y - 15, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-    # separator under header
-    sep_y = page_h - 90
-    _hr(c, page_w, sep_y)
-    return sep_y  # caller can base the next content from here
-
-
-def _draw_snapshot(c: canvas.Canvas, page_w: float, y: float, img_bytes: bytes, reserve_below: float = 0) -> float:
-    """
-    Draw the snapshot image scaled to fit the available box.
-    Returns the y just after the section (including its separator).
-    """
-    img = ImageReader(io.BytesIO(img_bytes))
-    iw, ih = img.getSize()
+def _summary_table(tpl: ReportTemplate, title_id: str | None, owner: str | None, avail_w: float) -> Table:
+    def _p(txt: str | None) -> Paragraph:
+        return Paragraph(escape(txt or "—"), tpl.value_style)
+
+    summary_data = [
+        [Paragraph("Title ID", tpl.label_style), _p(title_id)],
+        [Paragraph("Owner", tpl.label_style), _p(owner)],
+    ]
+    table = Table(summary_data, colWidths=[100, avail_w - 100], hAlign="LEFT")
+    table.setStyle(tpl.summary_table_style)
+    return table
 
-    margin = 28
-    left = margin
-    right = page_w - margin
-    max_w = right - left
 
-    # available height from current y to bottom margin, keeping space below
-    max_h = max(0, (y - margin) - reserve_below)
+def _fmt(value, spec: str = "{}") -> str:
+    return "—" if value is None else spec.format(value)
 
-    if max_w > 0 and max_h > 0:
-        scale = min(max_w / iw, max_h / ih)
-        w = max(1, iw * scale)
-        h = max(1, ih * scale)
-        x = (page_w - w) / 2
-        c.drawImage(img, x, y - h, width=w, height=h, preserveAspectRatio=True, mask='auto')
-        y = y - h - 5  # gap after image
 
-    # separator under snapshot section
-    # _hr(c, page_w, y)
-    return y - 10  # small gap after separator
+def _boundaries_table(tpl: ReportTemplate, boundaries: list[dict] | None, avail_w: float) -> LongTable:
+    """
+    One LongTable for all rows; header row repeats on every page it spills onto.
+    Body cells are plain single-line strings with fixed row heights, so neither
+    Paragraph parsing nor per-split row measuring happens and cost stays linear in rows.
+    """
+    header = [Paragraph(f"<b>{h}</b>", tpl.label_style) for h in ("NS", "Deg", "Min", "EW", "Distance (m)")]
+    rows: list[list] = [header]
+    if boundaries:
+        for b in boundaries:
+            rows.append([
+                b.get("ns") or "—",
+                _fmt(b.get("deg")),
+                _fmt(b.get("min")),
+                b.get("ew") or "—",
+                _fmt(b.get("distance"), "{:.2f}"),
+            ])
+    else:
+        rows.append(["—"] * 5)
+
+    table = LongTable(
+        rows,
+        colWidths=[60, 60, 60, 60, avail_w - 240],
+        rowHeights=[BOUNDARY_HEADER_H] + [BOUNDARY_ROW_H] * (len(rows) - 1),
+        repeatRows=1,
+        hAlign="LEFT",
+    )
+    table.setStyle(tpl.boundaries_table_style)
+    return table
+
+
+def _report_story(tpl: ReportTemplate, payload: ReportData, img_bytes: bytes | None, avail_w: float) -> list:
+    """Flowables for one property: snapshot, summary and the paginated boundaries table."""
+    boundaries = [b.model_dump() if hasattr(b, "model_dump") else b for b in (payload.boundaries or [])]
+    story: list = []
+    story += _snapshot_flowables(tpl, payload, img_bytes, avail_w)
+    story += [
+        _summary_table(tpl, payload.title_number, payload.owner, avail_w),
+        Spacer(1, 20),
+        # keep the heading with at least the table header + a few rows (no orphaned heading)
+        CondPageBreak(BOUNDARY_HEADER_H + 4 * BOUNDARY_ROW_H + 20),
+        Paragraph("Boundaries", tpl.heading_style),
+        _boundaries_table(tpl, boundaries, avail_w),
+    ]
+    return story
 
 
-def _make_summary_table(page_w: float, title_id: str | None, owner: str | None, boundaries: list[dict] | None):
-    margin = 28
-    avail_w = page_w - (2 * margin)
+def _build_pdf(items: list[tuple[ReportData, bytes | None]]) -> bytes:
+    """
+    Build the report with a platypus flowable layout:
+      header + footer drawn per page, then one story per property (each starting
+      on a fresh page). CPU-bound; runs on the report executor.
+    """
+    tpl = get_report_template()
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=A4,
+        leftMargin=MARGIN,
+        rightMargin=MARGIN,
+        topMargin=tpl.top_margin,
+        bottomMargin=tpl.bottom_margin,
+        title="Land Tracker Summary Report",
+    )
+    story: list = []
+    for i, (payload, img_bytes) in enumerate(items):
+        if i:
+            story.append(PageBreak())
+        story += _report_story(tpl, payload, img_bytes, doc.width)
 
-    styles = getSampleStyleSheet()
-    label_style = ParagraphStyle("label", parent=styles["Normal"], fontName="Helvetica-Bold", fontSize=10)
-    value_style = ParagraphStyle("value", parent=styles["Normal"], fontName="Helvetica", fontSize=10, leading=13)
+    doc.build(story, onFirstPage=tpl.decorate_page, onLaterPages=tpl.decorate_page)
+    return buf.getvalue()
 
-    def _p(txt: str | None, style: ParagraphStyle) -> Paragraph:
-        from xml.sax.saxutils import escape
-        return Paragraph(escape(txt or "—"), style)
 
-    # Header info
-    summary_data = [
-        [Paragraph("Title ID", label_style), _p(title_id, value_style)],
-        [Paragraph("Owner", label_style), _p(owner, value_style)],
-    ]
+def _render_report_pdf(payload: ReportData, img_bytes: bytes | None) -> bytes:
+    return _build_pdf([(payload, img_bytes)])
 
-    # Boundaries section
-    boundary_rows = [
-        [Paragraph("<b>NS</b>", label_style),
-         Paragraph("<b>Deg</b>", label_style),
-         Paragraph("<b>Min</b>", label_style),
-         Paragraph("<b>EW</b>", label_style),
-         Paragraph("<b>Distance (m)</b>", label_style)]
-    ]
 
-    if boundaries:
-        for b in boundaries:
-            boundary_rows.append([
-                _p(b.get("ns"), value_style),
-                _p(str(b.get("deg")), value_style),
-                _p(str(b.get("min")), value_style),
-                _p(b.get("ew"), value_style),
-                _p(f"{b.get('distance'):.2f}", value_style),
-            ])
-    else:
-        boundary_rows.append(["—"] * 5)
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
 
-    # Combine summary and boundary tables visually stacked
-    summary_table = Table(summary_data, colWidths=[100, avail_w - 100], hAlign="LEFT")
-    summary_table.setStyle(TableStyle([
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#B0B0B0")),
-        ("BACKGROUND", (0, 0), (0, -1), colors.lightblue),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ]))
 
-    boundaries_table = Table(boundary_rows, colWidths=[60, 60, 60, 60, avail_w - 240])
-    boundaries_table.setStyle(TableStyle([
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#B0B0B0")),
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-    ]))
+def _render_and_store(payload: ReportData, img_bytes: bytes | None, store_key: str | None) -> bytes:
+    """Executor job: render the PDF and (optionally) store it as a content-addressed blob."""
+    pdf_bytes = _render_report_pdf(payload, img_bytes)
+    if store_key:
+        write_blob(store_key, pdf_bytes)
+    return pdf_bytes
 
-    return summary_table, boundaries_table
 
+def _render_merged_and_store(items: list[tuple[ReportData, bytes | None]], store_key: str | None) -> bytes:
+    """Executor job: one PDF containing every property's report, (optionally) kept on disk as a blob."""
+    pdf_bytes = _build_pdf(items)
+    if store_key:
+        write_blob(store_key, pdf_bytes)
+    return pdf_bytes
 
-def _draw_summary_table(c: canvas.Canvas, page_w: float, y: float, table: Table) -> float:
-    """Draw heading, table, and a separator below the summary section. Return the y after the separator."""
-    margin = 28
-    left = margin
-    avail_w = page_w - (2 * margin)
 
-    # Heading
-    c.setFont("Helvetica-Bold", 12)
-    # c.drawString(left, y, "Summary")
-    y -= 16
+def _payload_key(payload: ReportData) -> str:
+    return report_key(
+        property_id=payload.property_id,
+        title_number=payload.title_number,
+        owner=payload.owner,
+        boundaries=[b.model_dump() if hasattr(b, "model_dump") else b for b in (payload.boundaries or [])],
+        snapshot_url=str(payload.snapshot) if payload.snapshot else None,
+    )
 
-    # Table
-    _, h = table.wrapOn(c, avail_w, y)
-    table.drawOn(c, left, y - h)
-    y = (y - h) - 10  # gap after table
 
-    # separator under summary section
-    # _hr(c, page_w, y)
-    return y - 10  # small gap after separator
+def _pdf_headers(path: str | None, *, cache: str) -> dict:
+    return {
+        "Content-Disposition": 'inline; filename="LandTracker_Report.pdf"',
+        "X-Report-Path": path or "",
+        "X-Report-Cache": cache,
+    }
 
 
 @router.post("", response_class=StreamingResponse, summary="Generate Land Tracker PDF (server-side)")
@@ -221,106 +215,273 @@ async def generate_report_pdf(
     user=Depends(get_current_user),
 ):
     """
-    Builds a one-page PDF:
-      - Header (logo + title + timestamp)
+    Builds the PDF (as many pages as the boundaries need):
+      - Header (logo + title + timestamp) and page-number footer on every page
       - Optional snapshot (Google Static Maps)
       - Summary table (Title ID, Owner)
-      - Boundaries table (NS, Deg, Min, EW, Distance)
-    Saves a copy under REPORTS_DIR/<user.id>/... and records a PropertyReport row.
-    Streams the PDF back to the client.
+      - Boundaries table (NS, Deg, Min, EW, Distance), header row repeated per page
+    Reports are content-addressed: the PDF is stored under REPORTS_DIR/blobs/ keyed by a
+    hash of its inputs and recorded as a PropertyReport row. Re-requesting a report with
+    identical inputs returns the stored file without rendering or adding a row.
+
+    Rendering and the file write run on a bounded worker pool; when it is full
+    the request is rejected with 429 + Retry-After instead of queueing unbounded.
     """
-    # ---- Build PDF in-memory ----
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
-    page_w, page_h = A4
-
-    # Header
-    y = _draw_header(c, page_w, page_h)
-
-    # Tables (summary + boundaries)
-    summary_table, boundaries_table = _make_summary_table(
-        page_w,
-        payload.title_number,
-        payload.owner,
-        [b.dict() if hasattr(b, "dict") else b for b in (payload.boundaries or [])],
-    )
+    store_key = None
+    property_id = payload.property_id
+    if property_id is not None:
+        # Verify property ownership (before spending any render time)
+        prop = db.get(Property, property_id, options=load_profiles.OWNERSHIP)
+        if not prop or prop.user_id != user.id:
+            raise HTTPException(status_code=403, detail="Not your property")
 
-    # Compute reserved space below the snapshot so it doesn't overlap tables
-    avail_w = page_w - (2 * 28)
-    _, summary_h = summary_table.wrapOn(c, avail_w, 0)
-    _, boundaries_h = boundaries_table.wrapOn(c, avail_w, 0)
-
-    # Rough layout gaps/paddings (mirrors helpers)
-    #  - 16 for summary heading spacing inside _draw_summary_table
-    #  - +10 after summary table (inside _draw_summary_table)
-    #  - +18 for "Boundaries" heading
-    #  - +10 after boundaries table
-    #  - +10 extra breathing room
-    reserved_for_sections = 16 + summary_h + 10 + 18 + boundaries_h + 10 + 10
-
-    # Optional snapshot (above tables)
-    c.setFont("Helvetica-Bold", 12)
-    y -= 15
+        # Identical inputs -> serve the stored PDF, no render and no new row
+        store_key = _payload_key(payload)
+        existing = find_existing(db, property_id, store_key)
+        if existing:
+            return FileResponse(
+                existing.file_path,
+                media_type="application/pdf",
+                headers=_pdf_headers(existing.file_path, cache="hit"),
+            )
+
+    # Network I/O stays on the event loop (async httpx)
+    img_bytes = None
     if payload.snapshot:
         try:
             img_bytes = await _fetch_image_bytes(str(payload.snapshot))
-            y = _draw_snapshot(c, page_w, y, img_bytes, reserve_below=reserved_for_sections)
         except Exception:
-            c.setFont("Helvetica", 9)
-            c.drawString(40, y, "Snapshot could not be embedded.")
-            y -= 14
+            img_bytes = None
+        if img_bytes is None:
+            store_key = None  # degraded (no map): serve it, but don't cache it as the report for these inputs
 
-    # Draw summary table (Title ID, Owner)
-    y = _draw_summary_table(c, page_w, y, summary_table)
+    # ---- Render + persist off the event loop ----
+    try:
+        pdf_bytes = await report_executor.run(_render_and_store, payload, img_bytes, store_key)
+    except ExecutorSaturated as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Report renderer is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
-    # Draw "Boundaries" section
-    margin_left = 28
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(margin_left, y, "Boundaries")
-    y -= 18
+    saved_path = None
+    if store_key:
+        # Record in DB
+        saved_path = blob_path(store_key)
+        db.add(PropertyReport(property_id=property_id, file_path=saved_path, report_type="pdf", content_hash=store_key))
+        db.commit()
 
-    _, bh = boundaries_table.wrapOn(c, avail_w, y)
-    boundaries_table.drawOn(c, margin_left, y - bh)
-    y -= bh + 10
+    return StreamingResponse(
+        io.BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers=_pdf_headers(saved_path, cache="miss"),
+    )
 
-    # Footer (page number)
-    c.setFont("Helvetica", 8)
-    c.drawRightString(page_w - 28, 18, "Page 1")
 
-    c.showPage()
-    c.save()
+# ---------- Batch reports ----------
+def _stored_boundaries(prop: Property) -> list[dict]:
+    """Report rows from stored PropertyBoundary bearings (no client round-trip needed)."""
+    rows = []
+    for b in prop.boundaries:
+        if b.ns is not None:
+            parsed = {"ns": b.ns, "degrees": b.degrees, "minutes": b.minutes, "ew": b.ew}
+        else:
+            parsed = parse_bearing(b.bearing)  # rows stored before components were kept
+        if parsed:
+            rows.append({"ns": parsed["ns"], "deg": parsed["degrees"], "min": parsed["minutes"],
+                         "ew": parsed["ew"], "distance": b.distance_m})
+        else:
+            rows.append({"ns": b.bearing, "deg": None, "min": None, "ew": None, "distance": b.distance_m})
+    return rows
+
+
+async def _snapshot_or_none(url: str | None) -> bytes | None:
+    if not url:
+        return None
+    try:
+        return await _fetch_image_bytes(url)
+    except Exception:
+        return None
 
-    # ---- Persist & respond ----
-    buf.seek(0)
-    pdf_bytes = buf.getvalue()
 
-    saved_path = None
-    property_id = payload.property_id
-    if property_id is not None:
-        # Verify property ownership
-        prop = db.get(Property, property_id)
-        if not prop or prop.user_id != user.id:
-            raise HTTPException(status_code=403, detail="Not your property")
+async def _render_as_completed(jobs: list[tuple[ReportData, bytes | None, str | None, str | None]]):
+    """
+    Yield (payload, store_key, pdf_bytes | None, is_new) as each job finishes.
+    Jobs with an existing blob are just read back; the rest render with at most
+    `max_workers` in flight. A saturated pool is waited out (the response is
+    already streaming, so there is no 429 to send anymore).
+    """
+    gate = asyncio.Semaphore(report_executor.max_workers)
+
+    async def _one(payload: ReportData, img_bytes: bytes | None, store_key: str | None, existing_path: str | None):
+        if existing_path:
+            try:
+                return payload, store_key, await asyncio.to_thread(_read_file, existing_path), False
+            except OSError:
+                pass  # blob went missing: re-render it under the same key (its row already exists)
+        is_new = existing_path is None
+        async with gate:
+            while True:
+                try:
+                    pdf = await report_executor.run(_render_and_store, payload, img_bytes, store_key)
+                    return payload, store_key, pdf, is_new
+                except ExecutorSaturated as e:
+                    await asyncio.sleep(min(e.retry_after, 5))
+                except Exception:
+                    return payload, store_key, None, is_new
+
+    for fut in asyncio.as_completed([_one(*job) for job in jobs]):
+        yield await fut
+
+
+def _record_reports(new: list[tuple[int, str]]) -> None:
+    """Blocking (own session, one commit); called via asyncio.to_thread from the zip stream."""
+    with SessionLocal() as db:
+        # A blob that vanished from disk is re-rendered under the same key: its row is still there
+        have = set(db.execute(
+            select(PropertyReport.property_id, PropertyReport.content_hash).where(
+                PropertyReport.property_id.in_([pid for pid, _ in new]),
+                PropertyReport.content_hash.in_([key for _, key in new]),
+            )
+        ).tuples())
+        for property_id, store_key in new:
+            if (property_id, store_key) in have:
+                continue
+            db.add(PropertyReport(
+                property_id=property_id, file_path=blob_path(store_key), report_type="pdf", content_hash=store_key,
+            ))
+        db.commit()
 
-        # Save to disk
-        _ensure_dir(REPORTS_DIR)
-        user_dir = os.path.join(REPORTS_DIR, str(user.id))
-        _ensure_dir(user_dir)
-        fname = f"LandTracker_Report_p{property_id}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.pdf"
-        saved_path = os.path.join(user_dir, fname)
-        with open(saved_path, "wb") as f:
-            f.write(pdf_bytes)
 
-        # Record in DB
-        db.add(PropertyReport(property_id=property_id, file_path=saved_path, report_type="pdf"))
-        db.commit()
+async def _zip_stream(jobs: list[tuple[ReportData, bytes | None, str | None, str | None]]):
+    sink = ZipSink()
+    failed: list[int] = []
+    new: list[tuple[int, str]] = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        async for payload, store_key, pdf, is_new in _render_as_completed(jobs):
+            if pdf is None:
+                failed.append(payload.property_id)
+                continue
+            if is_new and store_key:
+                new.append((payload.property_id, store_key))
+            zf.writestr(f"LandTracker_Report_p{payload.property_id}.pdf", pdf)
+            yield sink.drain()
+        if failed:
+            zf.writestr("errors.txt", "Failed to render property ids: " + ", ".join(map(str, sorted(failed))) + "\n")
+    if new:
+        await asyncio.to_thread(_record_reports, new)
+    yield sink.drain()
+
+
+async def _store_reports(jobs: list[tuple[ReportData, bytes | None, str | None, str | None]]) -> None:
+    """Background task: render, store and record each property's own report (merged batch PDF)."""
+    new = [(payload.property_id, store_key) async for payload, store_key, pdf, _ in _render_as_completed(jobs) if pdf]
+    if new:
+        await asyncio.to_thread(_record_reports, new)
+
+
+@router.post("/batch", response_class=StreamingResponse, summary="Generate reports for many properties")
+async def generate_report_batch(
+    body: BatchReportRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Render reports for several owned properties from their stored boundaries.
+      - format="zip": per-property PDFs rendered in parallel on the report pool and
+        streamed into a ZIP as each one finishes.
+      - format="pdf": a single merged PDF (one render job, each property on new pages).
+        It is not recorded as anyone's report; properties without a stored report for
+        these inputs get their own PDF rendered and recorded after the response.
+    Every newly rendered per-property report gets a PropertyReport row; properties whose
+    inputs match an existing report reuse that stored PDF instead of re-rendering.
+    Snapshots (optional, per property) go through the shared snapshot cache.
+    """
+    ids = list(dict.fromkeys(body.property_ids))  # de-dup, keep order
+    if len(ids) > settings.report_batch_max:
+        raise HTTPException(status_code=422, detail=f"At most {settings.report_batch_max} properties per batch")
+
+    props = (
+        db.query(Property)
+        .options(*load_profiles.REPORT)
+        .filter(Property.id.in_(ids))
+        .all()
+    )
+    by_id = {p.id: p for p in props}
+    if any(pid not in by_id or by_id[pid].user_id != user.id for pid in ids):
+        raise HTTPException(status_code=403, detail="Not your property")
+
+    if report_executor.stats()["saturation"] >= 1:
+        raise HTTPException(
+            status_code=429,
+            detail="Report renderer is busy, please retry shortly",
+            headers={"Retry-After": str(report_executor.retry_after())},
+        )
+
+    snapshot_urls = {pid: str(url) for pid, url in body.snapshots.items()}
+    payloads = [
+        ReportData.model_construct(
+            property_id=pid,
+            title_number=by_id[pid].title_number,
+            owner=by_id[pid].owner,
+            snapshot=snapshot_urls.get(pid),
+            boundaries=_stored_boundaries(by_id[pid]),
+        )
+        for pid in ids
+    ]
+    keys = [_payload_key(p) for p in payloads]
+
+    existing = find_existing_many(db, dict(zip(ids, keys)))
 
+    if body.format == "pdf":
+        # The merged file is no property's report: it gets no row and is only cached on disk
+        # (unreferenced, so prune_unreferenced_blobs collects it after the grace period)
+        merged_key = combined_key(keys)
+        merged_path = blob_path(merged_key)
+        if len(existing) == len(ids) and os.path.exists(merged_path):
+            return FileResponse(merged_path, media_type="application/pdf", headers=_pdf_headers(None, cache="hit"))
+
+        images = await asyncio.gather(*(_snapshot_or_none(snapshot_urls.get(pid)) for pid in ids))
+        # A snapshot that failed to fetch would be baked in as "could not be embedded": don't store that
+        degraded = {pid for pid, img in zip(ids, images) if snapshot_urls.get(pid) and img is None}
+        try:
+            pdf_bytes = await report_executor.run(
+                _render_merged_and_store, list(zip(payloads, images)), None if degraded else merged_key
+            )
+        except ExecutorSaturated as e:
+            raise HTTPException(
+                status_code=429,
+                detail="Report renderer is busy, please retry shortly",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        # Each property's own report, as the ZIP path would store it, after the response goes out
+        missing = [
+            (payload, img, key, None)
+            for payload, img, key in zip(payloads, images, keys)
+            if payload.property_id not in existing and payload.property_id not in degraded
+        ]
+        if missing:
+            background_tasks.add_task(_store_reports, missing)
+        return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf", headers=_pdf_headers(None, cache="miss"))
+
+    # Only fetch snapshots for reports that actually need rendering
+    images = await asyncio.gather(*(
+        _snapshot_or_none(None if pid in existing else snapshot_urls.get(pid)) for pid in ids
+    ))
+    jobs = [
+        (
+            payload,
+            img,
+            # snapshot wanted but not fetched: render without storing (next request retries the map)
+            None if payload.snapshot and img is None and payload.property_id not in existing else key,
+            existing[payload.property_id].file_path if payload.property_id in existing else None,
+        )
+        for payload, img, key in zip(payloads, images, keys)
+    ]
     return StreamingResponse(
-        io.BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": 'inline; filename="LandTracker_Report.pdf"',
-            "X-Report-Path": saved_path or "",
-        },
+        _zip_stream(jobs),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="LandTracker_Reports.zip"'},
     )
-
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import asyncio
 import json
 from pydantic import ValidationError
 
@@ -9,6 +10,8 @@ from app.models.tie_point import TiePoint
 from app.schemas.tie_point import TiePointCreate, TiePointRead, TiePointImport
 from app.utils.strings import norm_str, norm_upper
 from app.core.deps import get_current_user
+from app.services.overlaps import run_overlap_checks
+from app.services.property_geometry import recompute_detached
 
 router = APIRouter(prefix="/v1/tie-points", tags=["TiePoints"], dependencies=[Depends(get_current_user)])
 
@@ -46,7 +49,11 @@ def list_tie_points(db: Session = Depends(get_db)):
 # docker compose exec db psql -U landtracker -d landtracker_db -c "DROP TABLE IF EXISTS tie_points CASCADE;"
 # curl -X POST http://127.0.0.1:8000/tie-points/import -F "file=@resources/tiepoints.json;type=application/json"
 @router.post("/import")
-async def import_tie_points(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def import_tie_points(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
     if file.content_type not in ("application/json", "text/json"):
         raise HTTPException(400, "Please upload a JSON file.")
 
@@ -62,6 +69,7 @@ async def import_tie_points(file: UploadFile = File(...), db: Session = Depends(
     created = 0
     updated = 0
     errors = []
+    moved_ids = []  # tie points whose coordinates changed -> anchored properties need new geometry
 
     for idx, item in enumerate(payload, start=1):
         try:
@@ -93,6 +101,8 @@ async def import_tie_points(file: UploadFile = File(...), db: Session = Depends(
             if east is not None and existing.easting != east:
                 existing.easting = east
                 changed = True
+            if changed:
+                moved_ids.append(existing.id)
 
             # Text fields will already be normalized; update if different
             if existing.tie_point_name != name:
@@ -122,7 +132,14 @@ async def import_tie_points(file: UploadFile = File(...), db: Session = Depends(
             created += 1
 
     db.commit()
-    return {"created": created, "updated": updated, "errors": errors, "total": len(payload)}
+    # Off the event loop, on its own session: may touch every parcel anchored on the moved points
+    recomputed = await asyncio.to_thread(recompute_detached, tie_point_ids=moved_ids)
+    if recomputed:
+        background_tasks.add_task(run_overlap_checks, recomputed)  # the parcels moved with their tie points
+    return {
+        "created": created, "updated": updated, "errors": errors, "total": len(payload),
+        "properties_recomputed": len(recomputed),
+    }
 
 
 @router.get("/provinces", response_model=List[Optional[str]])
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_current_user
+from app.db.session import get_db
+from app.services.file_serving import CACHE_CONTROL, etag_matches
+from app.services.tiles import MAX_ZOOM, get_tile
+
+router = APIRouter(prefix="/v1/tiles", tags=["Tiles"], dependencies=[Depends(get_current_user)])
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+@router.get("/{z}/{x}/{y}.mvt")
+def property_tile(
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    The caller's parcels ("properties" layer: polygons, or points when smaller than a
+    pixel) and their tie points ("tie_points" layer) as a Mapbox Vector Tile.
+    Geometry is simplified for the zoom level. Tiles are cached per user and change
+    (new ETag) whenever any of the user's properties does.
+    """
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+
+    data, version = get_tile(db, user.id, z, x, y)
+    etag = f'"{version}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    inm = request.headers.get("if-none-match")
+    if inm and etag_matches(inm, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=MVT_MEDIA_TYPE, headers=headers)
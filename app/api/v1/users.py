@@ -1,22 +1,23 @@
 from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status, Path
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_current_user, get_current_db_user
+from app.core.principal import Principal
 from app.models.user import User
 from app.models.role import Role
 from app.schemas.user import UserRead, UserUpdate, PasswordChange, SetRoleRequest
-from app.core.security import verify_password, hash_password
+from app.core.security import verify_password, hash_password, run_hashing
 
 router = APIRouter(prefix="/v1/users", tags=["users"], dependencies=[Depends(get_current_user)])
 
 
-def require_admin(user: User):
+def require_admin(user: Principal):
     if not user.role or user.role.name != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
 
 
 @router.get("/me", response_model=UserRead)
-def get_me(current_user: User = Depends(get_current_user)) -> User:
+def get_me(current_user: Principal = Depends(get_current_user)) -> Principal:
     return current_user
 
 
@@ -24,7 +25,7 @@ def get_me(current_user: User = Depends(get_current_user)) -> User:
 def update_me(
     payload: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_db_user),
 ) -> User:
     # email uniqueness (if provided)
     if payload.email is not None:
@@ -51,11 +52,11 @@ def update_me(
 def change_password(
     body: PasswordChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_db_user),
 ):
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not run_hashing(verify_password, body.current_password, current_user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
-    current_user.hashed_password = hash_password(body.new_password)
+    current_user.hashed_password = run_hashing(hash_password, body.new_password)
     db.add(current_user)
     db.commit()
     return {"ok": True}
@@ -67,7 +68,7 @@ def set_user_role(
     user_id: int = Path(..., ge=1),
     body: SetRoleRequest = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
     user = db.get(User, user_id)
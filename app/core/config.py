@@ -25,6 +25,18 @@ class Settings(BaseSettings):
     algorithm: str = Field("HS256", alias="JWT_ALGORITHM")
     access_token_expire_minutes: int = Field(30, alias="ACCESS_EXPIRE_MIN")
     refresh_token_expire_days: int = Field(7, alias="REFRESH_EXPIRE_DAYS")
+    revocation_sync_seconds: int = Field(30, alias="REVOCATION_SYNC_SECONDS")  # reload revoked token families
+
+    # --- Authenticated principal cache (per process; 0 disables) ---
+    # Upper bound on how long a change made by another worker, or outside the ORM Session
+    # (raw SQL, psql), takes to reach a cached principal (e.g. a deactivated user)
+    principal_cache_ttl_seconds: int = Field(30, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+    principal_cache_size: int = Field(10000, alias="PRINCIPAL_CACHE_SIZE")
+
+    # --- Password / OTP hashing (bcrypt, on its own bounded pool) ---
+    password_bcrypt_rounds: int = Field(12, alias="PASSWORD_BCRYPT_ROUNDS")  # changing it rehashes on next login
+    hash_workers: int = Field(2, alias="HASH_WORKERS")  # ~ CPU cores to spend on bcrypt
+    hash_queue: int = Field(32, alias="HASH_QUEUE")
 
     # --- Admin seed ---
     admin_email: Optional[str] = Field("admin@admin.com", alias="ADMIN_EMAIL")
@@ -43,12 +55,48 @@ class Settings(BaseSettings):
     otp_ttl_minutes: int = Field(5, alias="OTP_TTL_MINUTES")
     otp_max_attempts: int = Field(5, alias="OTP_MAX_ATTEMPTS")
     otp_resend_cooldown_seconds: int = Field(60, alias="OTP_RESEND_COOLDOWN_SECONDS")
+    otp_hmac_key: Optional[str] = Field(None, alias="OTP_HMAC_KEY")  # unset: derived from SECRET_KEY
 
     # --- Directories / Paths ---
     title_img_dir: str = Field("resources/uploads/title_images", alias="TITLE_IMG_DIR")
     reports_dir: str = Field("resources/reports", alias="LT_REPORTS_DIR")
     lt_logo_path: str = Field("app/static/logo.png", alias="LT_LOGO_PATH")
 
+    # --- Upload persistence (decode + write off the event loop) ---
+    file_io_workers: int = Field(8, alias="FILE_IO_WORKERS")
+    file_io_queue: int = Field(64, alias="FILE_IO_QUEUE")
+    file_write_concurrency: int = Field(4, alias="FILE_WRITE_CONCURRENCY")  # parallel writes per request
+
+    # --- Title image derivatives (WebP thumbnails / previews, cached next to originals) ---
+    image_thumb_px: int = Field(256, alias="IMAGE_THUMB_PX")  # longest edge
+    image_preview_px: int = Field(1024, alias="IMAGE_PREVIEW_PX")
+    image_webp_quality: int = Field(80, alias="IMAGE_WEBP_QUALITY")
+    image_derivative_workers: int = Field(2, alias="IMAGE_DERIVATIVE_WORKERS")
+    image_derivative_queue: int = Field(32, alias="IMAGE_DERIVATIVE_QUEUE")
+
+    # --- Parcel overlap detection ---
+    overlap_min_area_m2: float = Field(1.0, alias="OVERLAP_MIN_AREA_M2")  # ignore slivers from rounding
+
+    # --- Vector tiles (per-user, in-process cache) ---
+    tile_cache_size: int = Field(2048, alias="TILE_CACHE_SIZE")
+    tile_cache_ttl_seconds: int = Field(600, alias="TILE_CACHE_TTL_SECONDS")
+    tile_simplify_px: float = Field(0.5, alias="TILE_SIMPLIFY_PX")  # Douglas-Peucker tolerance, screen px
+
+    # --- Polygon exports (GeoJSON / KML / Shapefile) ---
+    export_batch_size: int = Field(1000, alias="EXPORT_BATCH_SIZE")  # rows fetched per keyset batch
+
+    # --- File downloads (optional Nginx X-Accel-Redirect offload) ---
+    x_accel_redirect_prefix: Optional[str] = Field(None, alias="X_ACCEL_REDIRECT_PREFIX")  # e.g. "/_protected"
+    x_accel_root: str = Field("resources", alias="X_ACCEL_ROOT")  # dir that Nginx aliases to the prefix
+
+    # --- Report rendering (off the event loop) ---
+    report_render_workers: int = Field(2, alias="REPORT_RENDER_WORKERS")
+    report_render_queue: int = Field(8, alias="REPORT_RENDER_QUEUE")  # jobs allowed to wait for a worker
+    report_batch_max: int = Field(50, alias="REPORT_BATCH_MAX")  # properties per batch request
+    snapshot_cache_size: int = Field(256, alias="SNAPSHOT_CACHE_SIZE")
+    snapshot_cache_ttl_seconds: int = Field(900, alias="SNAPSHOT_CACHE_TTL_SECONDS")
+    report_gc_grace_seconds: int = Field(3600, alias="REPORT_GC_GRACE_SECONDS")  # never GC files younger than this
+
     # --- Database ---
     database_url: Optional[str] = Field(None, alias="DATABASE_URL")  # full URL override
     db_user: str = Field("landtracker", alias="DB_USER")
@@ -60,11 +108,29 @@ class Settings(BaseSettings):
     # --- SMTP / Email ---
     smtp_host: str = Field("smtp-relay.brevo.com", alias="SMTP_HOST")
     smtp_port: int = Field(587, alias="SMTP_PORT")
-    smtp_user: str = Field(..., alias="SMTP_USER")
-    smtp_password: str = Field(..., alias="SMTP_PASSWORD")
+    smtp_user: str = Field("", alias="SMTP_USER")  # empty: no AUTH (e.g. local Mailpit)
+    smtp_password: str = Field("", alias="SMTP_PASSWORD")
+    smtp_starttls: bool = Field(True, alias="SMTP_STARTTLS")
+    smtp_timeout_seconds: float = Field(15.0, alias="SMTP_TIMEOUT_SECONDS")
+    smtp_idle_seconds: float = Field(60.0, alias="SMTP_IDLE_SECONDS")  # close the pooled connection after this
     smtp_from_name: str = Field("LandTracker", alias="SMTP_FROM_NAME")
     smtp_from_email: str = Field("no-reply@landtracker.ph", alias="SMTP_FROM_EMAIL")
 
+    # --- Outbox (email / SMS sent by a background sender, with retries) ---
+    outbox_enabled: bool = Field(True, alias="OUTBOX_ENABLED")  # run the sender thread in this process
+    outbox_batch_size: int = Field(50, alias="OUTBOX_BATCH_SIZE")
+    outbox_poll_seconds: float = Field(2.0, alias="OUTBOX_POLL_SECONDS")
+    outbox_lease_seconds: int = Field(120, alias="OUTBOX_LEASE_SECONDS")  # claimed rows retry after this if we die
+    outbox_max_attempts: int = Field(8, alias="OUTBOX_MAX_ATTEMPTS")
+    outbox_backoff_base_seconds: float = Field(30.0, alias="OUTBOX_BACKOFF_BASE_SECONDS")
+    outbox_backoff_max_seconds: float = Field(3600.0, alias="OUTBOX_BACKOFF_MAX_SECONDS")
+
+    # --- Maintenance (pruning expired tokens / codes / delivered outbox rows) ---
+    maintenance_interval_minutes: int = Field(60, alias="MAINTENANCE_INTERVAL_MINUTES")  # 0: only via admin endpoint
+    maintenance_batch_size: int = Field(1000, alias="MAINTENANCE_BATCH_SIZE")  # rows per DELETE (one short txn each)
+    maintenance_grace_hours: int = Field(24, alias="MAINTENANCE_GRACE_HOURS")  # keep expired rows this long
+    outbox_retention_days: int = Field(7, alias="OUTBOX_RETENTION_DAYS")  # sent / failed messages
+
     app_frontend_url: str = Field("https://landtracker.ph", alias="APP_FRONTEND_URL")
     app_backend_url: str = Field("https://landtracker.ph/api", alias="APP_BACKEND_URL")
 
@@ -8,18 +8,18 @@ from jose import jwt, JWTError
 from app.db.session import get_db
 from app.models.user import User
 from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.principal import Principal, get_principal
 from app.core.security import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[Session, Depends(get_db)],
-) -> User:
+def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Principal:
     """
-    Decode access token, fetch the user, ensure active.
-    We eager-load role to avoid lazy-load issues in dependencies.
+    Decode access token and return the (cached) principal, ensuring the user is active.
+    A cache hit costs no database query, and a miss doesn't open the request's session,
+    so routes that only need identity never hold a pooled connection.
+    See app.core.principal for invalidation.
     """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -30,10 +30,24 @@ def get_current_user(
     if data.type != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Access token required")
 
+    principal = get_principal(int(data.sub), data.jti)
+    if not principal or not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or missing user")
+    return principal
+
+
+def get_current_db_user(
+    principal: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_db)],
+) -> User:
+    """
+    The authenticated user as a live ORM row in this request's session, for endpoints
+    that modify the user or need the password hash.
+    """
     user = (
         db.query(User)
         .options(joinedload(User.role))  # eager-load role
-        .get(int(data.sub))
+        .get(principal.id)
     )
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive or missing user")
@@ -42,7 +56,7 @@ def get_current_user(
 
 # ---------- Role helpers (string-based) ----------
 
-def _has_any_role(user: User, allowed_names: Iterable[str]) -> bool:
+def _has_any_role(user: Principal | User, allowed_names: Iterable[str]) -> bool:
     """
     Check if user's role name matches any of the provided allowed names.
     Case-sensitive by default; make .lower() both sides if you prefer case-insensitive.
@@ -52,7 +66,7 @@ def _has_any_role(user: User, allowed_names: Iterable[str]) -> bool:
     return user.role.name in set(allowed_names)
 
 
-def ensure_role(user: User, *allowed_role_names: str) -> None:
+def ensure_role(user: Principal | User, *allowed_role_names: str) -> None:
     """
     Low-level guard you can call inside route handlers.
     """
@@ -69,7 +83,7 @@ def require_roles(*allowed_role_names: str):
         def admin_only(...):
             ...
     """
-    def _checker(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+    def _checker(current_user: Annotated[Principal, Depends(get_current_user)]) -> Principal:
         ensure_role(current_user, *allowed_role_names)
         return current_user
     return _checker
@@ -0,0 +1,165 @@
+# app/core/executors.py
+from __future__ import annotations
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.core.config import settings
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a BoundedExecutor has no free worker or queue slot."""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"Executor '{name}' is saturated")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard cap on (running + queued) jobs.
+
+    submit() never blocks: when every slot is taken it raises ExecutorSaturated
+    so callers can shed load (e.g. 429 + Retry-After) instead of piling up work.
+    Keeps simple counters for run time, queue wait and saturation.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+
+        self._submitted = 0
+        self._started = 0   # left the queue (queue-wait samples)
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._pending = 0   # queued + running
+        self._running = 0
+        self._run_total = 0.0
+        self._run_max = 0.0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # ---------- submission ----------
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorSaturated(self.name, self.retry_after())
+
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._pending += 1
+
+        def _job():
+            started_at = time.perf_counter()
+            wait = started_at - enqueued_at
+            with self._lock:
+                self._running += 1
+                self._started += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                elapsed = time.perf_counter() - started_at
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._run_total += elapsed
+                    self._run_max = max(self._run_max, elapsed)
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+                self._slots.release()
+
+        try:
+            return self._pool.submit(_job)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            raise
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Submit from async code and await the result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    # ---------- metrics ----------
+    def retry_after(self) -> int:
+        """Rough seconds until a slot frees up (average run time * jobs ahead per worker)."""
+        with self._lock:
+            done = self._completed + self._failed
+            avg = (self._run_total / done) if done else 1.0
+            ahead = max(1, self._pending)
+        return max(1, math.ceil(avg * ahead / self.max_workers))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self._completed + self._failed
+            capacity = self.max_workers + self.max_queue
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "saturation": round(self._pending / capacity, 3) if capacity else 0.0,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "run_seconds_avg": round(self._run_total / done, 4) if done else 0.0,
+                "run_seconds_max": round(self._run_max, 4),
+                "queue_wait_seconds_avg": round(self._wait_total / self._started, 4) if self._started else 0.0,
+                "queue_wait_seconds_max": round(self._wait_max, 4),
+            }
+
+
+# ---------- Shared executors ----------
+report_executor = BoundedExecutor(
+    "report-render",
+    max_workers=settings.report_render_workers,
+    max_queue=settings.report_render_queue,
+)
+
+file_io_executor = BoundedExecutor(
+    "file-io",
+    max_workers=settings.file_io_workers,
+    max_queue=settings.file_io_queue,
+)
+
+image_executor = BoundedExecutor(
+    "image-derivatives",
+    max_workers=settings.image_derivative_workers,
+    max_queue=settings.image_derivative_queue,
+)
+
+hash_executor = BoundedExecutor(
+    "password-hashing",
+    max_workers=settings.hash_workers,
+    max_queue=settings.hash_queue,
+)
+
+EXECUTORS: Dict[str, BoundedExecutor] = {
+    report_executor.name: report_executor,
+    file_io_executor.name: file_io_executor,
+    image_executor.name: image_executor,
+    hash_executor.name: hash_executor,
+}
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: ex.stats() for name, ex in EXECUTORS.items()}
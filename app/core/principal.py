@@ -0,0 +1,154 @@
+# app/core/principal.py
+"""
+Authenticated principal cache: immutable snapshots of a user and their role, keyed by the
+access token's (sub, jti), so requests that only need identity don't touch the database.
+
+Entries live for PRINCIPAL_CACHE_TTL_SECONDS. Any committed change to a User row (role,
+active flag, password, profile) or deletion drops that user's entries; any Role change
+drops everything, and so does a bulk UPDATE/DELETE on either table issued through a
+Session (rows unknown). Invalidation is per process, so other workers converge within
+the TTL; so do writes that bypass the ORM Session entirely (raw connections, psql).
+"""
+from __future__ import annotations
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.role import Role
+from app.models.user import User
+
+_STALE_KEY = "principal_cache_stale"
+_ALL = object()
+
+
+@dataclass(frozen=True)
+class RoleSnapshot:
+    id: int
+    name: str
+    description: Optional[str]
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Read-only view of the authenticated user (same attribute names as User, minus the password hash)."""
+    id: int
+    email: str
+    mobile: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    is_active: bool
+    is_verified: bool
+    created_at: Optional[datetime]
+    role_id: int
+    role: Optional[RoleSnapshot]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        role = user.role
+        return cls(
+            id=user.id,
+            email=user.email,
+            mobile=user.mobile,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            created_at=user.created_at,
+            role_id=user.role_id,
+            role=RoleSnapshot(role.id, role.name, role.description) if role else None,
+        )
+
+
+_cache: TTLCache = TTLCache(maxsize=max(settings.principal_cache_size, 1), ttl=max(settings.principal_cache_ttl_seconds, 1))
+_generation: dict[int, int] = {}  # user id -> bumped on every invalidation
+_global_generation = 0
+_lock = threading.Lock()
+
+
+def _load(user_id: int) -> Optional[Principal]:
+    """Own short session: the connection goes back to the pool before the handler runs."""
+    with SessionLocal() as db:
+        user = db.query(User).options(joinedload(User.role)).get(user_id)
+        return Principal.from_user(user) if user else None
+
+
+def get_principal(user_id: int, jti: str) -> Optional[Principal]:
+    """Cached snapshot for this token, loading the user (with role) on a miss. None if the user is gone."""
+    if settings.principal_cache_ttl_seconds <= 0:
+        return _load(user_id)
+
+    key = (user_id, jti)
+    with _lock:
+        hit = _cache.get(key)
+        generation = (_global_generation, _generation.get(user_id, 0))
+    if hit is not None:
+        return hit
+
+    principal = _load(user_id)
+    if principal is None:
+        return None
+    with _lock:
+        # Don't store a snapshot that an invalidation raced past while we were loading it
+        if generation == (_global_generation, _generation.get(user_id, 0)):
+            _cache[key] = principal
+    return principal
+
+
+def invalidate_user(user_id: int) -> None:
+    with _lock:
+        _generation[user_id] = _generation.get(user_id, 0) + 1
+        for key in [k for k in _cache.keys() if k[0] == user_id]:
+            _cache.pop(key, None)
+
+
+def invalidate_all() -> None:
+    global _global_generation
+    with _lock:
+        _global_generation += 1
+        _generation.clear()
+        _cache.clear()
+
+
+# ---------- invalidation on commit (every session: API, admin UI, scripts) ----------
+@event.listens_for(Session, "after_flush")
+def _collect_stale(session: Session, _flush_context) -> None:
+    stale = session.info.setdefault(_STALE_KEY, set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            stale.add(obj.id)
+        elif isinstance(obj, Role):
+            stale.add(_ALL)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_stale(state) -> None:
+    """Bulk query(User).update() / update(User) / delete(...) never reach the flush: drop everything."""
+    if not (state.is_update or state.is_delete):
+        return
+    mapper = state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, (User, Role)):
+        state.session.info.setdefault(_STALE_KEY, set()).add(_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    stale = session.info.pop(_STALE_KEY, None)
+    if not stale:
+        return
+    if _ALL in stale:
+        invalidate_all()
+        return
+    for user_id in stale:
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale(session: Session) -> None:
+    session.info.pop(_STALE_KEY, None)
@@ -0,0 +1,80 @@
+# app/core/revocation.py
+"""
+Revoked refresh-token families, held in memory so replays of a stolen token are turned
+away without a database round-trip.
+
+A family is revoked when one of its tokens is presented again after rotation (reused_at
+is set on that row and every token of the family is revoked). This process adds the
+family here at once; other workers pick it up on their next sync, at most
+REVOCATION_SYNC_SECONDS later. The set is only a fast path: rotation itself is a
+conditional UPDATE on is_revoked, so a stale set never lets a revoked token through.
+"""
+from __future__ import annotations
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.refresh_token import RefreshToken
+
+_revoked: frozenset[str] = frozenset()
+_synced_at: float | None = None  # monotonic time of the last (started) sync
+_lock = threading.Lock()
+
+
+def _load() -> frozenset[str]:
+    """Families with a reused token that could still be presented (not yet expired)."""
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(RefreshToken.family_id)
+            .where(
+                RefreshToken.reused_at.is_not(None),
+                RefreshToken.family_id.is_not(None),
+                RefreshToken.expires_at > datetime.now(timezone.utc),
+            )
+            .distinct()
+        ).scalars()
+        return frozenset(rows)
+
+
+def sync() -> None:
+    """Replace the set with the DB's view (a family marked here a moment ago is already committed there)."""
+    global _revoked
+    loaded = _load()
+    with _lock:
+        _revoked = loaded
+
+
+def _due() -> bool:
+    """True for exactly one caller once the set is older than REVOCATION_SYNC_SECONDS."""
+    global _synced_at
+    now = time.monotonic()
+    with _lock:
+        if _synced_at is not None and now - _synced_at < settings.revocation_sync_seconds:
+            return False
+        _synced_at = now
+        return True
+
+
+def is_family_revoked(family_id: str | None) -> bool:
+    if not family_id:
+        return False
+    if _due():
+        sync()
+    return family_id in _revoked
+
+
+def mark_family_revoked(family_id: str) -> None:
+    global _revoked
+    with _lock:
+        _revoked = _revoked | {family_id}
+
+
+def stats() -> dict:
+    return {
+        "revoked_families": len(_revoked),
+        "synced_seconds_ago": None if _synced_at is None else round(time.monotonic() - _synced_at, 1),
+    }
@@ -1,14 +1,22 @@
 from __future__ import annotations
+import hashlib
+import hmac
+import secrets
 import uuid
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Optional
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
 from app.core.config import (
-    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+    settings, SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
 )
+from app.core.executors import hash_executor, ExecutorSaturated
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with a different cost count as outdated: verify_and_update() returns a fresh one
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.password_bcrypt_rounds)
 
 
 class TokenPayload(BaseModel):
@@ -16,6 +24,7 @@ class TokenPayload(BaseModel):
     type: str    # "access" | "refresh"
     role: str
     jti: str     # NEW: token id for refresh rotation
+    fam: Optional[str] = None  # refresh token family (absent on tokens issued before families)
     iat: int
     exp: int
 
@@ -28,7 +37,88 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
 
-def _create_token(*, sub: str, role: str, token_type: str, expires_delta: timedelta, jti: str | None = None) -> str:
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return pwd_context.hash(uuid.uuid4().hex)
+
+
+def verify_and_update(password: str, hashed: Optional[str]) -> tuple[bool, Optional[str]]:
+    """
+    (ok, new_hash): new_hash is set when the password matched but was hashed with
+    other settings (e.g. PASSWORD_BCRYPT_ROUNDS changed) and should be stored.
+    A missing hash still costs one bcrypt, so unknown accounts take as long as known ones.
+    """
+    if not hashed:
+        pwd_context.verify(password, _dummy_hash())
+        return False, None
+    return pwd_context.verify_and_update(password, hashed)
+
+
+# ---------- OTP codes ----------
+# Short-lived 6-digit codes: guessing is bounded by max_attempts, not by hash cost, so a
+# keyed HMAC-SHA256 ("hmac$<salt>$<digest>") replaces bcrypt. Without the key a leaked
+# table can't be brute-forced offline at all. Rows written before the switch hold bcrypt
+# hashes ("$2b$..."); they are still verified (on the hashing pool) until they expire.
+_legacy_otp_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache(maxsize=1)
+def _otp_key() -> bytes:
+    if settings.otp_hmac_key:
+        return settings.otp_hmac_key.encode("utf-8")
+    return hmac.new(SECRET_KEY.encode("utf-8"), b"landtracker-otp-v1", hashlib.sha256).digest()
+
+
+def _otp_digest(salt: str, code: str) -> str:
+    return hmac.new(_otp_key(), f"{salt}:{code}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def hash_otp(code: str) -> str:
+    salt = secrets.token_hex(8)
+    return f"hmac${salt}${_otp_digest(salt, code)}"
+
+
+def verify_otp(code: str, code_hash: str) -> bool:
+    if code_hash.startswith("hmac$"):
+        try:
+            _, salt, digest = code_hash.split("$", 2)
+        except ValueError:
+            return False
+        return hmac.compare_digest(_otp_digest(salt, code), digest)
+    return run_hashing(_legacy_otp_ctx.verify, code, code_hash)
+
+
+# ---------- hashing pool ----------
+# bcrypt is ~100-250 ms of CPU per call. Every hash/verify goes through hash_executor so
+# only HASH_WORKERS run at once and bursts are refused (429) instead of starving other work.
+def _saturated(e: ExecutorSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def run_hashing(fn: Callable[..., Any], *args) -> Any:
+    """From sync code (already on a worker thread): run fn on the hashing pool and wait."""
+    try:
+        future = hash_executor.submit(fn, *args)
+    except ExecutorSaturated as e:
+        raise _saturated(e)
+    return future.result()
+
+
+async def run_hashing_async(fn: Callable[..., Any], *args) -> Any:
+    """From async code: run fn on the hashing pool without blocking the event loop."""
+    try:
+        return await hash_executor.run(fn, *args)
+    except ExecutorSaturated as e:
+        raise _saturated(e)
+
+
+def _create_token(
+    *, sub: str, role: str, token_type: str, expires_delta: timedelta, jti: str | None = None, fam: str | None = None
+) -> str:
     now = datetime.now(timezone.utc)
     payload = {
         "sub": sub,
@@ -38,6 +128,8 @@ def _create_token(*, sub: str, role: str, token_type: str, expires_delta: timede
         "iat": int(now.timestamp()),
         "exp": int((now + expires_delta).timestamp()),
     }
+    if fam:
+        payload["fam"] = fam
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -50,12 +142,13 @@ def create_access_token(user_id: int, role: str) -> str:
     )
 
 
-def create_refresh_token(user_id: int, role: str, jti: str) -> str:
-    # We supply the jti so we can store the same value in DB
+def create_refresh_token(user_id: int, role: str, jti: str, family_id: str | None = None) -> str:
+    # We supply the jti (and family) so we can store the same values in DB
     return _create_token(
         sub=str(user_id),
         role=role,
         token_type="refresh",
         expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
         jti=jti,
+        fam=family_id,
     )
@@ -0,0 +1,78 @@
+# app/db/load_profiles.py
+"""
+Named loading strategies for Property.
+
+Relationships on the model are plain lazy loads; each query states what it
+needs by picking one of these profiles instead of paying for everything:
+
+  - OWNERSHIP: just id + user_id, for "is this yours?" checks before other work
+  - FULL:      the PropertyOut shape (columns + images, boundaries, reports)
+  - SUMMARY:   list-view columns only; child collections raise if touched, so
+               a projection can't quietly turn into N+1 lazy loads
+  - REPORT:    what a PDF report is built from (title, owner, boundaries)
+"""
+from __future__ import annotations
+from typing import Iterable
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
+
+from app.models.property import Property
+# Options below configure the mappers at import time; every related class must be registered first
+from app.models import property_boundary, property_image, property_report, tie_point, user  # noqa: F401
+
+SUMMARY_COLUMNS = (
+    Property.id, Property.user_id, Property.title_number, Property.owner,
+    Property.tie_point_id, Property.created_at, Property.updated_at,
+)
+
+# Child collections a summary may opt into (?include=)
+COLLECTIONS = {
+    "images": Property.images,
+    "boundaries": Property.boundaries,
+    "reports": Property.reports,
+}
+
+# Stored geometry columns (Property.geometry); a summary opts in with include=geometry
+GEOMETRY_COLUMNS = (
+    Property.geom_polygon, Property.centroid_lon, Property.centroid_lat,
+    Property.bbox_min_lon, Property.bbox_min_lat, Property.bbox_max_lon, Property.bbox_max_lat,
+    Property.area_m2,
+)
+
+SUMMARY_INCLUDES = (*COLLECTIONS, "geometry")
+
+OWNERSHIP = (load_only(Property.id, Property.user_id),)
+
+
+def full(without: Iterable[str] = ()) -> tuple:
+    """FULL, minus collections the caller is about to populate itself."""
+    return tuple(selectinload(rel) for name, rel in COLLECTIONS.items() if name not in without)
+
+
+FULL = full()
+
+REPORT = (
+    load_only(Property.id, Property.user_id, Property.title_number, Property.owner),
+    selectinload(Property.boundaries),
+)
+
+
+def summary(include: Iterable[str] = ()) -> tuple:
+    include = set(include)
+    columns = SUMMARY_COLUMNS + (GEOMETRY_COLUMNS if "geometry" in include else ())
+    return (
+        load_only(*columns),
+        *(selectinload(rel) for name, rel in COLLECTIONS.items() if name in include),
+        raiseload("*"),
+    )
+
+
+def load_property(db: Session, property_id: int, profile: tuple = FULL) -> Property:
+    """db.get() with a load profile; 404 when missing. Ownership is left to the caller."""
+    # populate_existing: an instance already in the session (e.g. from an OWNERSHIP
+    # check) is re-read with this profile instead of being returned as-is.
+    prop = db.get(Property, property_id, options=profile, populate_existing=True)
+    if not prop:
+        raise HTTPException(status_code=404, detail="Property not found")
+    return prop
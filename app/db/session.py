@@ -1,6 +1,10 @@
 # app/db/session.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 from app.db.base import Base  # <- use the single Base
 
@@ -8,18 +12,122 @@ engine = create_engine(settings.sqlalchemy_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class LazySession:
+    """
+    Stand-in for a request's Session that only creates it on first use. Handlers that
+    never touch the database (validation errors, cache hits, pure compute) cost neither
+    a Session nor a pooled connection; everything else is forwarded to the real Session.
+    """
+
+    __slots__ = ("_session",)
+
+    def __init__(self):
+        self._session: Session | None = None
+
+    @property
+    def materialized(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str):
+        if self._session is None:
+            self._session = SessionLocal()
+        return getattr(self._session, name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
 def get_db():
-    db = SessionLocal()
+    db = LazySession()
     try:
         yield db
     finally:
         db.close()
 
 
+class PoolStats:
+    """Connection pool checkout counters (per process), fed by pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self._peak = 0
+        self._checkouts = 0
+        self._hold_total = 0.0
+        self._hold_max = 0.0
+
+    def on_checkout(self, _dbapi_conn, record, _proxy) -> None:
+        record.info["lt_checkout_at"] = time.perf_counter()
+        with self._lock:
+            self._checkouts += 1
+            self._checked_out += 1
+            self._peak = max(self._peak, self._checked_out)
+
+    def on_checkin(self, _dbapi_conn, record) -> None:
+        started = record.info.pop("lt_checkout_at", None)
+        if started is None:
+            return
+        held = time.perf_counter() - started
+        with self._lock:
+            self._checked_out -= 1
+            self._hold_total += held
+            self._hold_max = max(self._hold_max, held)
+
+    def stats(self) -> Dict[str, Any]:
+        pool = engine.pool
+        with self._lock:
+            out = {
+                "checked_out": self._checked_out,
+                "checked_out_peak": self._peak,
+                "checkouts": self._checkouts,
+                "hold_seconds_avg": round(self._hold_total / self._checkouts, 4) if self._checkouts else 0.0,
+                "hold_seconds_max": round(self._hold_max, 4),
+            }
+        for name in ("size", "overflow", "checkedin"):
+            fn = getattr(pool, name, None)
+            if callable(fn):
+                out[f"pool_{name}"] = fn()
+        return out
+
+
+pool_stats = PoolStats()
+event.listen(engine, "checkout", pool_stats.on_checkout)
+event.listen(engine, "checkin", pool_stats.on_checkin)
+
+
 def init_models():
     # Import ALL model modules so metadata is populated before create_all
     from app.models import (
         user, role, refresh_token, otp_code, tie_point,  # existing
-        property as prop, property_image, property_boundary, property_report  # NEW
+        property as prop, property_image, property_boundary, property_report,  # NEW
+        property_overlap, outbox_message,
     )  # noqa: F401
     Base.metadata.create_all(bind=engine)
+    _sync_additive_schema()
+
+
+def _sync_additive_schema():
+    """
+    create_all() only creates missing tables. Bring existing tables up to date
+    with purely additive model changes: new nullable columns and new indexes.
+    Anything else (renames, type changes, NOT NULL columns) still needs a manual migration.
+    """
+    insp = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing_cols = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in existing_cols or not col.nullable:
+                    continue
+                col_type = col.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(col)} {col_type}"
+                ))
+            existing_idx = {i["name"] for i in insp.get_indexes(table.name)}
+            for idx in table.indexes:
+                if idx.name not in existing_idx:
+                    idx.create(bind=conn, checkfirst=True)
@@ -10,6 +10,8 @@ from app.db.session import init_models, SessionLocal
 from app.models.user import User
 from app.models.role import Role
 from app.core.security import hash_password
+from app.services.maintenance import runner as maintenance_runner
+from app.services.outbox import sender as outbox_sender
 
 # Routers (import once, include once)
 from app.api.v1.auth import router as auth_router
@@ -23,6 +25,7 @@ from app.api.v1.users import router as users_router
 # from app.api.v1.staticmap import router as map_router
 from app.api.v1.report_pdf import router as report_pdf_router
 from app.api.v1.properties import router as properties_router
+from app.api.v1.tiles import router as tiles_router
 
 from starlette.middleware.sessions import SessionMiddleware
 from app.admin import mount_admin
@@ -104,6 +107,16 @@ def on_startup():
 
         db.commit()
 
+    if settings.outbox_enabled:
+        outbox_sender.start()
+    maintenance_runner.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    outbox_sender.stop()
+    maintenance_runner.stop()
+
 
 # Mount API v1 routers (once)
 app.include_router(auth_router)
@@ -117,6 +130,7 @@ app.include_router(users_router)
 # app.include_router(map_router)
 app.include_router(report_pdf_router)
 app.include_router(properties_router)
+app.include_router(tiles_router)
 
 
 # --- Optional request logging helpers ---
@@ -1,7 +1,7 @@
 # app/models/email_verify_token.py
 from __future__ import annotations
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -19,3 +19,6 @@ class EmailVerifyToken(Base):
     is_used: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     user = relationship("User", lazy="joined")
+
+
+Index("ix_email_verify_tokens_expires_at", EmailVerifyToken.expires_at)
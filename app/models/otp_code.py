@@ -39,3 +39,4 @@ class OtpCode(Base):
 
 
 Index("ix_otp_user_purpose_active", OtpCode.user_id, OtpCode.purpose)
+Index("ix_otp_codes_expires_at", OtpCode.expires_at)
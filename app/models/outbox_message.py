@@ -0,0 +1,44 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import Integer, String, Text, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class OutboxChannel(str):
+    EMAIL = "email"
+    SMS = "sms"
+
+
+class OutboxStatus(str):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # gave up (permanent error or out of attempts)
+
+
+class OutboxMessage(Base):
+    """An email or SMS written in the same transaction as the change that caused it, delivered later."""
+    __tablename__ = "outbox_messages"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    channel: Mapped[str] = mapped_column(String(16), nullable=False)
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[Optional[str]] = mapped_column(String(255))
+    body_html: Mapped[Optional[str]] = mapped_column(Text)
+    body_text: Mapped[Optional[str]] = mapped_column(Text)
+
+    status: Mapped[str] = mapped_column(String(16), default=OutboxStatus.PENDING, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+
+Index("ix_outbox_status_next_attempt", OutboxMessage.status, OutboxMessage.next_attempt_at)
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional, List
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, ForeignKey, DateTime, func
+from sqlalchemy import String, Text, Float, JSON, ForeignKey, DateTime, func, Index
 
 from app.db.base import Base
 
@@ -31,26 +31,64 @@ class Property(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
+    # --- Stored geometry (WGS84), derived from tie point + boundaries; see services/property_geometry ---
+    geom_polygon: Mapped[Optional[list]] = mapped_column(JSON(none_as_null=True), nullable=True)  # closed ring of [lon, lat]
+    centroid_lon: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    centroid_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    bbox_min_lon: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    bbox_min_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    bbox_max_lon: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    bbox_max_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    area_m2: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
     # --- Relationships ---
+    # All lazy; queries choose what to load via app.db.load_profiles
     images: Mapped[List["PropertyImage"]] = relationship(
         back_populates="property",
         cascade="all, delete-orphan",
         order_by="PropertyImage.order_index",
-        lazy="selectin",
+        lazy="select",
     )
     boundaries: Mapped[List["PropertyBoundary"]] = relationship(
         back_populates="property",
         cascade="all, delete-orphan",
         order_by="PropertyBoundary.id",
-        lazy="selectin",
+        lazy="select",
     )
     reports: Mapped[List["PropertyReport"]] = relationship(
         back_populates="property",
         cascade="all, delete-orphan",
         order_by="PropertyReport.created_at.desc()",
-        lazy="selectin",
+        lazy="select",
     )
 
     # Optional object refs (not exposed in your schema)
-    tie_point: Mapped["TiePoint"] = relationship("TiePoint", lazy="joined")
-    user: Mapped[Optional["User"]] = relationship("User", lazy="joined")
\ No newline at end of file
+    tie_point: Mapped["TiePoint"] = relationship("TiePoint", lazy="select")
+    user: Mapped[Optional["User"]] = relationship("User", lazy="select")
+
+    @property
+    def geometry(self) -> Optional[dict]:
+        if self.geom_polygon is None:
+            return None
+        return {
+            "polygon": self.geom_polygon,
+            "centroid": [self.centroid_lon, self.centroid_lat],
+            "bbox": [self.bbox_min_lon, self.bbox_min_lat, self.bbox_max_lon, self.bbox_max_lat],
+            "area_m2": self.area_m2,
+        }
+
+    # Fetch server-generated columns (created_at, ...) in the INSERT/UPDATE via RETURNING,
+    # so write endpoints can build their response without reloading the row
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # Keyset pagination of a user's properties: ORDER BY created_at DESC, id DESC
+        Index("ix_properties_user_created_id", "user_id", "created_at", "id"),
+        # Viewport queries (Postgres, no PostGIS needed): core GiST over the bbox as a `box`.
+        # The expression must match property_geometry.bbox_box() used in the query for the planner to pick it.
+        Index(
+            "ix_properties_bbox_gist",
+            func.box(func.point(bbox_min_lon, bbox_min_lat), func.point(bbox_max_lon, bbox_max_lat)),
+            postgresql_using="gist",
+        ).ddl_if(dialect="postgresql"),
+    )
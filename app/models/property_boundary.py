@@ -1,6 +1,6 @@
 from __future__ import annotations
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Index, Float, String, ForeignKey
+from sqlalchemy import Index, Float, Integer, String, ForeignKey
 
 from app.db.base import Base
 
@@ -16,6 +16,13 @@ class PropertyBoundary(Base):
     bearing: Mapped[str] = mapped_column(String(64))
     distance_m: Mapped[float] = mapped_column(Float)
 
+    # Parsed bearing components (NULL when the bearing string couldn't be parsed)
+    ns: Mapped[str | None] = mapped_column(String(1), nullable=True)
+    degrees: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ew: Mapped[str | None] = mapped_column(String(1), nullable=True)
+
     property = relationship("Property", back_populates="boundaries")
 
     __table_args__ = (
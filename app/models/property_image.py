@@ -23,6 +23,10 @@ class PropertyImage(Base):
 
     property = relationship("Property", back_populates="images")
 
+    # Fetch server-generated columns (created_at, ...) in the INSERT/UPDATE via RETURNING,
+    # so write endpoints can build their response without reloading the row
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         UniqueConstraint("property_id", "order_index", name="uq_property_image_order"),
         Index("ix_property_images_property_id_order", "property_id", "order_index"),
@@ -0,0 +1,30 @@
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Float, ForeignKey, DateTime, func, UniqueConstraint
+
+from app.db.base import Base
+
+
+class PropertyOverlap(Base):
+    """One direction of a detected overlap; each pair is stored both ways (see services/overlaps)."""
+    __tablename__ = "property_overlaps"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    property_id: Mapped[int] = mapped_column(
+        ForeignKey("properties.id", ondelete="CASCADE"), index=True
+    )
+    other_property_id: Mapped[int] = mapped_column(
+        ForeignKey("properties.id", ondelete="CASCADE"), index=True
+    )
+
+    overlap_area_m2: Mapped[float] = mapped_column(Float)
+    overlap_ratio: Mapped[float] = mapped_column(Float)  # share of property_id's own area
+
+    detected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint("property_id", "other_property_id", name="uq_property_overlap_pair"),
+    )
@@ -16,6 +16,8 @@ class PropertyReport(Base):
 
     report_type: Mapped[str] = mapped_column(String(64), index=True)
     file_path: Mapped[str] = mapped_column(String(512))
+    # sha256 of the render inputs (see services/report_store.report_key); NULL for uploaded reports
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -23,6 +25,11 @@ class PropertyReport(Base):
 
     property = relationship("Property", back_populates="reports")
 
+    # Fetch server-generated columns (created_at, ...) in the INSERT/UPDATE via RETURNING,
+    # so write endpoints can build their response without reloading the row
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         Index("ix_property_reports_property_id_created_at", "property_id", "created_at"),
+        Index("ix_property_reports_property_id_content_hash", "property_id", "content_hash"),
     )
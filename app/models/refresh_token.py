@@ -14,6 +14,8 @@ class RefreshToken(Base):
     # JWT ID (unique random uuid per refresh token)
     jti: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    # All tokens rotated from one login share a family ("fam" claim); reusing any of them revokes the family
+    family_id: Mapped[Optional[str]] = mapped_column(String(32))
 
     # Security flags
     is_revoked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
@@ -36,3 +38,6 @@ class RefreshToken(Base):
 
 
 Index("ix_refresh_tokens_user_revoked", RefreshToken.user_id, RefreshToken.is_revoked)
+Index("ix_refresh_tokens_expires_at", RefreshToken.expires_at)
+Index("ix_refresh_tokens_family_id", RefreshToken.family_id)
+Index("ix_refresh_tokens_reused_at", RefreshToken.reused_at)
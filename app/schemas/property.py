@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, computed_field
 
 
 # --- Shared read-only pieces (show up in outputs) ---
@@ -9,14 +9,31 @@ class BoundaryOut(BaseModel):
     id: int
     bearing: str
     distance_m: float
+    ns: Optional[str] = None
+    degrees: Optional[int] = None
+    minutes: Optional[int] = None
+    seconds: Optional[float] = None
+    ew: Optional[str] = None
 
 
 class ImageOut(BaseModel):
     id: int
+    property_id: int
     file_path: str
     order_index: int
     created_at: datetime
 
+    # WebP derivatives, generated on upload (or on first request for older images)
+    @computed_field
+    @property
+    def thumbnail_url(self) -> str:
+        return f"/v1/properties/{self.property_id}/images/{self.id}/thumbnail"
+
+    @computed_field
+    @property
+    def preview_url(self) -> str:
+        return f"/v1/properties/{self.property_id}/images/{self.id}/preview"
+
 
 class ReportOut(BaseModel):
     id: int
@@ -29,6 +46,12 @@ class ReportOut(BaseModel):
 class BoundaryCreate(BaseModel):
     bearing: str
     distance_m: float
+    # Optional structured bearing (same fields as /parse output); parsed from `bearing` when omitted
+    ns: Optional[str] = None
+    degrees: Optional[int] = None
+    minutes: Optional[int] = None
+    seconds: Optional[float] = None
+    ew: Optional[str] = None
 
 
 class TitleImageCreate(BaseModel):
@@ -41,6 +64,13 @@ class ReportCreate(BaseModel):
     data_url: str  # must be PDF
 
 
+class PropertyGeometry(BaseModel):
+    polygon: List[List[float]]  # closed WGS84 ring of [lon, lat]
+    centroid: List[float]       # [lon, lat]
+    bbox: List[float]           # [min_lon, min_lat, max_lon, max_lat]
+    area_m2: float
+
+
 # --- Property models ---
 class PropertyCreate(BaseModel):
     user_id: int
@@ -61,6 +91,38 @@ class PropertyOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    # Stored server-side; None until the property has a tie point with coordinates and parseable boundaries
+    geometry: Optional[PropertyGeometry] = None
+
     images: List[ImageOut] = []
     boundaries: List[BoundaryOut] = []
     reports: List[ReportOut] = []
+
+
+class PropertySummaryOut(BaseModel):
+    """List-view projection: no technical description; geometry and child collections only on ?include=."""
+    id: int
+    user_id: int
+    title_number: str
+    owner: str
+    tie_point_id: int
+
+    created_at: datetime
+    updated_at: datetime
+
+    geometry: Optional[PropertyGeometry] = None
+    images: Optional[List[ImageOut]] = None
+    boundaries: Optional[List[BoundaryOut]] = None
+    reports: Optional[List[ReportOut]] = None
+
+
+class PropertyPage(BaseModel):
+    items: List[PropertySummaryOut]
+    next_cursor: Optional[str] = None
+
+
+class OverlapOut(BaseModel):
+    other_property_id: int
+    other_title_number: str
+    overlap_area_m2: float
+    overlap_ratio: float  # share of this property's area
@@ -1,6 +1,6 @@
 from __future__ import annotations
-from pydantic import BaseModel, HttpUrl
-from typing import List
+from pydantic import BaseModel, HttpUrl, Field
+from typing import Dict, List, Literal
 
 
 class BoundaryItem(BaseModel):
@@ -17,3 +17,9 @@ class ReportData(BaseModel):
     owner: str
     snapshot: HttpUrl
     boundaries: List[BoundaryItem]
+
+
+class BatchReportRequest(BaseModel):
+    property_ids: List[int] = Field(..., min_length=1)
+    format: Literal["zip", "pdf"] = "zip"  # zip of per-property PDFs, or one merged PDF
+    snapshots: Dict[int, HttpUrl] = {}     # optional Static Maps URL per property_id
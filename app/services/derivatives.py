@@ -0,0 +1,84 @@
+# app/services/derivatives.py
+from __future__ import annotations
+import io
+import logging
+import os
+from typing import Dict, Iterable
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.core.executors import image_executor, ExecutorSaturated
+from app.services.storage import _write_atomic
+
+log = logging.getLogger(__name__)
+
+# variant -> longest edge in px
+VARIANTS: Dict[str, int] = {
+    "thumb": settings.image_thumb_px,
+    "medium": settings.image_preview_px,
+}
+
+
+def derivative_path(original: str, variant: str) -> str:
+    """`<dir>/<stem>.<variant>.webp`, next to the original."""
+    stem, _ext = os.path.splitext(original)
+    return f"{stem}.{variant}.webp"
+
+
+def is_fresh(original: str, derived: str) -> bool:
+    """The derivative exists and is not older than the original (replaced in place -> stale)."""
+    try:
+        return os.stat(derived).st_mtime_ns >= os.stat(original).st_mtime_ns
+    except OSError:
+        return False
+
+
+def generate_derivatives(original: str, variants: Iterable[str] | None = None) -> Dict[str, str]:
+    """
+    Decode the original once and write every missing/stale WebP variant,
+    largest first so each smaller one is resized from the previous result.
+    Returns {variant: path}.
+    """
+    wanted = sorted(variants or VARIANTS, key=lambda v: VARIANTS[v], reverse=True)
+    out = {v: derivative_path(original, v) for v in wanted}
+    todo = [v for v in wanted if not is_fresh(original, out[v])]
+    if not todo:
+        return out
+
+    with Image.open(original) as im:
+        # JPEG: let the decoder downscale by 1/2..1/8 instead of decoding full size
+        largest = VARIANTS[todo[0]]
+        im.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(im)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+
+        for variant in todo:
+            size = VARIANTS[variant]
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            img.save(buf, "WEBP", quality=settings.image_webp_quality, method=4)
+            _write_atomic(out[variant], [buf.getvalue()])
+    return out
+
+
+def schedule_derivatives(paths: Iterable[str]) -> None:
+    """
+    Fire-and-forget generation for freshly stored images. If the pool is busy the
+    work is simply skipped; the thumbnail/preview endpoints generate lazily.
+    """
+    for path in paths:
+        try:
+            fut = image_executor.submit(generate_derivatives, path)
+        except ExecutorSaturated:
+            log.info("image-derivatives pool saturated, deferring %s", path)
+            continue
+        fut.add_done_callback(_log_failure)
+
+
+def _log_failure(fut) -> None:
+    exc = fut.exception()
+    if exc is not None:
+        log.warning("derivative generation failed: %s", exc)
+
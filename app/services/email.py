@@ -1,15 +1,12 @@
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.utils import formataddr
-from app.core.config import SMTP_FROM_NAME, SMTP_FROM_EMAIL, SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD
+from app.core.config import settings, SMTP_FROM_NAME, SMTP_FROM_EMAIL
 
 
-def send_email(to: str, subject: str, html: str, text: str | None = None):
-    """
-    Send transactional email via Brevo SMTP.
-    Uses TLS on port 587 and an SMTP key (NOT API key).
-    """
+def build_message(to: str, subject: str, html: str | None, text: str | None = None) -> MIMEMultipart:
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
     msg["From"] = formataddr((SMTP_FROM_NAME, SMTP_FROM_EMAIL))
@@ -17,9 +14,84 @@ def send_email(to: str, subject: str, html: str, text: str | None = None):
 
     if text:
         msg.attach(MIMEText(text, "plain"))
-    msg.attach(MIMEText(html, "html"))
+    if html:
+        msg.attach(MIMEText(html, "html"))
+    return msg
+
+
+def is_transient(exc: Exception) -> bool:
+    """Worth retrying later: 4xx replies and connection trouble. Other SMTP errors are permanent."""
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    # SMTPException subclasses OSError, so rule out the remaining protocol errors first
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+class SmtpConnection:
+    """
+    One reusable SMTP session: connects (STARTTLS / AUTH per settings) on first send,
+    then stays open across messages until it has been idle for SMTP_IDLE_SECONDS.
+    Not thread-safe; each sender thread owns one.
+    """
 
-    with smtplib.SMTP(SMTP_HOST, int(SMTP_PORT)) as s:
-        s.starttls()
-        s.login(SMTP_USER, SMTP_PASSWORD)
-        s.sendmail(SMTP_FROM_EMAIL, [to], msg.as_string())
+    def __init__(self):
+        self._smtp: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        s = smtplib.SMTP(settings.smtp_host, int(settings.smtp_port), timeout=settings.smtp_timeout_seconds)
+        try:
+            if settings.smtp_starttls:
+                s.starttls()
+            if settings.smtp_user:
+                s.login(settings.smtp_user, settings.smtp_password)
+        except Exception:
+            s.close()
+            raise
+        return s
+
+    def send(self, msg: MIMEMultipart) -> None:
+        to = [msg["To"]]
+        if self._smtp is not None and time.monotonic() - self._last_used > settings.smtp_idle_seconds:
+            self.close()
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.sendmail(SMTP_FROM_EMAIL, to, msg.as_string())
+        except OSError as e:
+            if isinstance(e, smtplib.SMTPException) and not isinstance(e, smtplib.SMTPServerDisconnected):
+                raise
+            # The server dropped a pooled connection: reconnect once and retry
+            self.close()
+            self._smtp = self._connect()
+            self._smtp.sendmail(SMTP_FROM_EMAIL, to, msg.as_string())
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        if self._smtp is not None and time.monotonic() - self._last_used > settings.smtp_idle_seconds:
+            self.close()
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+
+def send_email(to: str, subject: str, html: str, text: str | None = None):
+    """
+    Send one message right now on its own connection (scripts / diagnostics).
+    Request handlers should use app.services.outbox.enqueue_email instead.
+    """
+    conn = SmtpConnection()
+    try:
+        conn.send(build_message(to, subject, html, text))
+    finally:
+        conn.close()
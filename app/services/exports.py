@@ -0,0 +1,273 @@
+# app/services/exports.py
+"""
+Streaming exports of a user's parcel polygons (the stored WGS84 geometry) as GeoJSON,
+KML or a zipped ESRI Shapefile. Rows are read in keyset batches of plain column tuples,
+so memory stays bounded by the batch size whatever the number of parcels.
+"""
+from __future__ import annotations
+import json
+import os
+import struct
+import tempfile
+import zipfile
+from datetime import date
+from typing import Iterator, NamedTuple, Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.property import Property
+from app.services.property_geometry import bbox_intersects
+
+Bbox = tuple[float, float, float, float]
+
+FORMATS = {
+    # format -> (media type, file extension)
+    "geojson": ("application/geo+json", "geojson"),
+    "kml": ("application/vnd.google-earth.kml+xml", "kml"),
+    "shp": ("application/zip", "zip"),
+}
+
+_CHUNK = 64 * 1024
+
+
+class ExportRow(NamedTuple):
+    id: int
+    title_number: Optional[str]
+    owner: Optional[str]
+    area_m2: Optional[float]
+    polygon: list[list[float]]
+
+
+def iter_rows(user_id: int, bbox: Optional[Bbox] = None, *, batch_size: Optional[int] = None) -> Iterator[ExportRow]:
+    """
+    The user's properties that have stored geometry, in id order. Opens its own session
+    (the response streams after the request's session is closed) and pages by id, so no
+    cursor or transaction stays open while the client is slow to read.
+    """
+    batch_size = batch_size or settings.export_batch_size
+    last_id = 0
+    with SessionLocal() as db:
+        where = [Property.user_id == user_id, Property.geom_polygon.is_not(None)]
+        if bbox is not None:
+            where.append(bbox_intersects(db.get_bind().dialect.name, *bbox))
+        while True:
+            rows = db.execute(
+                select(Property.id, Property.title_number, Property.owner, Property.area_m2, Property.geom_polygon)
+                .where(*where, Property.id > last_id)
+                .order_by(Property.id)
+                .limit(batch_size)
+            ).all()
+            db.rollback()  # end the read transaction between batches
+            if not rows:
+                return
+            for row in rows:
+                yield ExportRow(*row)
+            last_id = rows[-1].id
+
+
+def _batched(parts: Iterator[str]) -> Iterator[bytes]:
+    """Coalesce small text pieces into ~64 KiB chunks of UTF-8."""
+    buf: list[str] = []
+    size = 0
+    for part in parts:
+        buf.append(part)
+        size += len(part)
+        if size >= _CHUNK:
+            yield "".join(buf).encode("utf-8")
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+# ---------- GeoJSON ----------
+def _geojson_parts(rows: Iterator[ExportRow]) -> Iterator[str]:
+    yield '{"type":"FeatureCollection","features":['
+    sep = ""
+    for r in rows:
+        feature = {
+            "type": "Feature",
+            "id": r.id,
+            "geometry": {"type": "Polygon", "coordinates": [r.polygon]},
+            "properties": {"id": r.id, "title_number": r.title_number, "owner": r.owner, "area_m2": r.area_m2},
+        }
+        yield sep + json.dumps(feature, separators=(",", ":"), ensure_ascii=False)
+        sep = ","
+    yield "]}\n"
+
+
+def geojson_stream(rows: Iterator[ExportRow]) -> Iterator[bytes]:
+    return _batched(_geojson_parts(rows))
+
+
+# ---------- KML ----------
+def _kml_parts(rows: Iterator[ExportRow]) -> Iterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<kml xmlns="http://www.opengis.net/kml/2.2"><Document><name>LandTracker properties</name>\n'
+    )
+    for r in rows:
+        coords = " ".join(f"{lon!r},{lat!r},0" for lon, lat in r.polygon)
+        area = f"{r.area_m2:.2f}" if r.area_m2 is not None else ""
+        yield (
+            f'<Placemark id="property-{r.id}"><name>{escape(r.title_number or "")}</name>'
+            "<ExtendedData>"
+            f'<Data name="id"><value>{r.id}</value></Data>'
+            f'<Data name="owner"><value>{escape(r.owner or "")}</value></Data>'
+            f'<Data name="area_m2"><value>{area}</value></Data>'
+            "</ExtendedData>"
+            f"<Polygon><outerBoundaryIs><LinearRing><coordinates>{coords}</coordinates></LinearRing></outerBoundaryIs></Polygon>"
+            "</Placemark>\n"
+        )
+    yield "</Document></kml>\n"
+
+
+def kml_stream(rows: Iterator[ExportRow]) -> Iterator[bytes]:
+    return _batched(_kml_parts(rows))
+
+
+# ---------- Shapefile (zipped .shp/.shx/.dbf/.prj/.cpg) ----------
+_SHP_POLYGON = 5
+_WGS84_PRJ = (
+    'GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",SPHEROID["WGS_1984",6378137.0,298.257223563]],'
+    'PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]]'
+)
+# (name, type, length, decimals); names are at most 10 characters
+_DBF_FIELDS = (
+    ("ID", b"N", 10, 0),
+    ("TITLE_NO", b"C", 64, 0),
+    ("OWNER", b"C", 128, 0),
+    ("AREA_M2", b"N", 18, 2),
+)
+
+
+class ZipSink:
+    """Write-only, non-seekable file object: zipfile streams into it, we drain chunks out."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def _shp_header(file_words: int, bbox: Bbox) -> bytes:
+    return (
+        struct.pack(">7i", 9994, 0, 0, 0, 0, 0, file_words)
+        + struct.pack("<2i", 1000, _SHP_POLYGON)
+        + struct.pack("<4d", *bbox)
+        + struct.pack("<4d", 0.0, 0.0, 0.0, 0.0)  # z / m ranges (unused)
+    )
+
+
+def _shp_polygon(ring: list[list[float]]) -> tuple[bytes, Bbox]:
+    """Record content for a single-ring polygon; the outer ring must run clockwise."""
+    if ring[0] != ring[-1]:
+        ring = ring + [ring[0]]
+    signed = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:]))
+    if signed > 0:
+        ring = ring[::-1]
+    lons = [p[0] for p in ring]
+    lats = [p[1] for p in ring]
+    bbox = (min(lons), min(lats), max(lons), max(lats))
+    content = (
+        struct.pack("<i4d2ii", _SHP_POLYGON, *bbox, 1, len(ring), 0)
+        + struct.pack(f"<{2 * len(ring)}d", *(c for p in ring for c in p))
+    )
+    return content, bbox
+
+
+def _dbf_value(value, ftype: bytes, length: int, decimals: int) -> bytes:
+    if ftype == b"N":
+        text = "" if value is None else (f"{value:.{decimals}f}" if decimals else str(int(value)))
+        return text.rjust(length)[:length].encode("ascii")
+    raw = (value or "").encode("utf-8")[:length].decode("utf-8", "ignore").encode("utf-8")
+    return raw.ljust(length, b" ")
+
+
+def _dbf_header(records: int) -> bytes:
+    today = date.today()
+    header_len = 32 + 32 * len(_DBF_FIELDS) + 1
+    record_len = 1 + sum(f[2] for f in _DBF_FIELDS)
+    out = struct.pack("<4BIHH20x", 0x03, today.year - 1900, today.month, today.day, records, header_len, record_len)
+    for name, ftype, length, decimals in _DBF_FIELDS:
+        out += struct.pack("<11sc4xBB14x", name.encode("ascii"), ftype, length, decimals)
+    return out + b"\r"
+
+
+def _write_shapefile(rows: Iterator[ExportRow], folder: str, base: str) -> list[str]:
+    """Write the component files one record at a time, then patch the headers (counts, extent)."""
+    paths = {ext: os.path.join(folder, f"{base}.{ext}") for ext in ("shp", "shx", "dbf", "prj", "cpg")}
+    extent = None
+    count = 0
+    with open(paths["shp"], "wb") as shp, open(paths["shx"], "wb") as shx, open(paths["dbf"], "wb") as dbf:
+        for f in (shp, shx):
+            f.write(b"\0" * 100)
+        dbf.write(_dbf_header(0))
+        offset = 50  # in 16-bit words, right after the 100-byte header
+        for r in rows:
+            content, bbox = _shp_polygon(r.polygon)
+            count += 1
+            words = len(content) // 2
+            shp.write(struct.pack(">2i", count, words) + content)
+            shx.write(struct.pack(">2i", offset, words))
+            offset += 4 + words
+            extent = bbox if extent is None else (
+                min(extent[0], bbox[0]), min(extent[1], bbox[1]), max(extent[2], bbox[2]), max(extent[3], bbox[3])
+            )
+            values = (r.id, r.title_number, r.owner, r.area_m2)
+            dbf.write(b" " + b"".join(_dbf_value(v, *f[1:]) for v, f in zip(values, _DBF_FIELDS)))
+        dbf.write(b"\x1a")
+
+        extent = extent or (0.0, 0.0, 0.0, 0.0)
+        shp.seek(0)
+        shp.write(_shp_header(offset, extent))
+        shx.seek(0)
+        shx.write(_shp_header(50 + 4 * count, extent))
+        dbf.seek(0)
+        dbf.write(_dbf_header(count))
+
+    with open(paths["prj"], "w", encoding="ascii") as f:
+        f.write(_WGS84_PRJ)
+    with open(paths["cpg"], "w", encoding="ascii") as f:
+        f.write("UTF-8")
+    return list(paths.values())
+
+
+def shapefile_zip_stream(rows: Iterator[ExportRow], base: str = "properties") -> Iterator[bytes]:
+    """
+    Shapefile headers carry the record count and extent, so the parts are written to a
+    temporary directory first; the ZIP is then streamed from disk in 64 KiB pieces.
+    """
+    with tempfile.TemporaryDirectory(prefix="lt-export-") as folder:
+        paths = _write_shapefile(rows, folder, base)
+        sink = ZipSink()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for path in paths:
+                with open(path, "rb") as src, zf.open(os.path.basename(path), "w") as dst:
+                    while chunk := src.read(_CHUNK):
+                        dst.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            yield data
+        yield sink.drain()
+
+
+def export_stream(fmt: str, user_id: int, bbox: Optional[Bbox] = None) -> Iterator[bytes]:
+    rows = iter_rows(user_id, bbox)
+    if fmt == "geojson":
+        return geojson_stream(rows)
+    if fmt == "kml":
+        return kml_stream(rows)
+    return shapefile_zip_stream(rows)
@@ -0,0 +1,99 @@
+# app/services/file_serving.py
+from __future__ import annotations
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from app.core.config import settings
+
+# Authenticated downloads: caches may keep a copy but must revalidate (ETag) every time.
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(st: os.stat_result) -> str:
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match semantics: `*` or any listed tag equal to `etag` (weak comparison)."""
+    if header.strip() == "*":
+        return True
+    candidates = [t.strip() for t in header.split(",")]
+    return any(t.removeprefix("W/") == etag for t in candidates)
+
+
+def _not_modified_since(header: str, st: os.stat_result) -> bool:
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(st.st_mtime) <= since
+
+
+def _accel_path(path: str) -> str | None:
+    """Internal Nginx URI for `path`, if offload is configured and the file lives under X_ACCEL_ROOT."""
+    prefix = settings.x_accel_redirect_prefix
+    if not prefix:
+        return None
+    root = os.path.realpath(settings.x_accel_root)
+    real = os.path.realpath(path)
+    if os.path.commonpath([root, real]) != root:
+        return None
+    rel = os.path.relpath(real, root).replace(os.sep, "/")
+    return prefix.rstrip("/") + "/" + rel
+
+
+def serve_file(
+    request: Request,
+    path: str,
+    *,
+    media_type: str | None = None,
+    filename: str | None = None,
+    inline: bool = True,
+) -> Response:
+    """
+    Serve a stored file after the caller has done its ownership checks.
+
+    - ETag / Last-Modified on every response; If-None-Match / If-Modified-Since -> 304.
+    - With X_ACCEL_REDIRECT_PREFIX set, the body is handed off to Nginx
+      (X-Accel-Redirect), which does sendfile + Range itself, e.g.:
+          location /_protected/ { internal; alias /app/resources/; }
+    - Otherwise Starlette's FileResponse streams it, including single/multi Range (206).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="File missing")
+
+    media_type = media_type or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    filename = filename or os.path.basename(path)
+    etag = _etag(st)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+    inm = request.headers.get("if-none-match")
+    ims = request.headers.get("if-modified-since")
+    if (inm and etag_matches(inm, etag)) or (not inm and ims and _not_modified_since(ims, st)):
+        return Response(status_code=304, headers=headers)
+
+    disposition = "inline" if inline else "attachment"
+    accel = _accel_path(path)
+    if accel:
+        headers["X-Accel-Redirect"] = accel
+        headers["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+        return Response(status_code=200, media_type=media_type, headers=headers)
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type=disposition,
+        headers=headers,
+        stat_result=st,
+    )
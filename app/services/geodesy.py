@@ -1,4 +1,7 @@
+import threading
+
 from geographiclib.geodesic import Geodesic
+from pyproj import Transformer
 
 
 geod = Geodesic.WGS84
@@ -7,3 +10,39 @@ geod = Geodesic.WGS84
 def next_point(lat: float, lon: float, theta_deg: float, distance_m: float):
     r = geod.Direct(lat, lon, theta_deg, distance_m)
     return r["lat2"], r["lon2"]
+
+
+def bearing_azimuth(ns: str, degrees: float, minutes: float, seconds: float | None = None, ew: str | None = None) -> float:
+    """Quadrant bearing (e.g. N 45°30' E) -> azimuth in degrees clockwise from north."""
+    angle = degrees + minutes / 60.0 + (seconds or 0.0) / 3600.0
+    ns, ew = (ns or "").upper(), (ew or "").upper()
+    if ns == "N" and ew == "E":
+        return angle
+    if ns == "N" and ew == "W":
+        return 360 - angle
+    if ns == "S" and ew == "E":
+        return 180 - angle
+    return 180 + angle
+
+
+_local = threading.local()
+
+
+def prs92_zone3_to_wgs84() -> Transformer:
+    """
+    PRS92 / Philippines zone 3 (EPSG:3123) -> WGS84 lon/lat. Building one costs
+    milliseconds, so it's built once per thread (pyproj objects aren't shared across threads).
+    """
+    tr = getattr(_local, "prs92_zone3", None)
+    if tr is None:
+        tr = _local.prs92_zone3 = Transformer.from_crs("EPSG:3123", "EPSG:4326", always_xy=True)
+    return tr
+
+
+def polygon_area_m2(ring: list[list[float]]) -> float:
+    """Geodesic area of a [lon, lat] ring on the WGS84 ellipsoid."""
+    poly = geod.Polygon()
+    for lon, lat in ring:
+        poly.AddPoint(lat, lon)
+    _n, _perimeter, area = poly.Compute(False, True)
+    return abs(area)
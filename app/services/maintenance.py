@@ -0,0 +1,133 @@
+# app/services/maintenance.py
+"""
+Housekeeping for the tables that grow with every login, refresh and verification:
+expired refresh tokens, OTP codes and email-verify tokens, plus delivered outbox rows.
+
+Rows go in batches of MAINTENANCE_BATCH_SIZE, one short transaction per batch
+(DELETE ... WHERE id IN (SELECT id ... LIMIT n)), so no long-held locks and no
+table-wide scans: every predicate is on an indexed column.
+Revoked refresh tokens are kept until they expire, since reuse detection needs them.
+"""
+from __future__ import annotations
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.email_verify_token import EmailVerifyToken
+from app.models.otp_code import OtpCode
+from app.models.outbox_message import OutboxMessage, OutboxStatus
+from app.models.refresh_token import RefreshToken
+
+log = logging.getLogger(__name__)
+
+TABLES = (RefreshToken, OtpCode, EmailVerifyToken, OutboxMessage)
+
+
+def _prune_where(db: Session, model, where, batch_size: int) -> int:
+    total = 0
+    while True:
+        ids = select(model.id).where(where).order_by(model.id).limit(batch_size).scalar_subquery()
+        n = db.execute(delete(model).where(model.id.in_(ids)), execution_options={"synchronize_session": False}).rowcount
+        db.commit()
+        total += n
+        if n < batch_size:
+            return total
+
+
+def prune_expired(db: Session, *, batch_size: Optional[int] = None, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Delete rows past their usefulness; returns rows deleted per table."""
+    batch_size = batch_size or settings.maintenance_batch_size
+    now = now or datetime.now(timezone.utc)
+    expired_before = now - timedelta(hours=settings.maintenance_grace_hours)
+    outbox_before = now - timedelta(days=settings.outbox_retention_days)
+    return {
+        RefreshToken.__tablename__: _prune_where(db, RefreshToken, RefreshToken.expires_at < expired_before, batch_size),
+        OtpCode.__tablename__: _prune_where(db, OtpCode, OtpCode.expires_at < expired_before, batch_size),
+        EmailVerifyToken.__tablename__: _prune_where(
+            db, EmailVerifyToken, EmailVerifyToken.expires_at < expired_before, batch_size
+        ),
+        OutboxMessage.__tablename__: _prune_where(
+            db,
+            OutboxMessage,
+            OutboxMessage.status.in_([OutboxStatus.SENT, OutboxStatus.FAILED]) & (OutboxMessage.created_at < outbox_before),
+            batch_size,
+        ),
+    }
+
+
+def table_sizes(db: Session) -> Dict[str, Dict[str, Any]]:
+    """
+    {"rows", "estimated", "bytes"} per table. On Postgres both figures come from the catalog
+    (reltuples estimate, pg_total_relation_size incl. indexes and TOAST) so this stays cheap;
+    elsewhere rows is an exact count and bytes is None.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    postgres = db.get_bind().dialect.name == "postgresql"
+    for model in TABLES:
+        name = model.__tablename__
+        if postgres:
+            rows, size = db.execute(
+                text("SELECT c.reltuples::bigint, pg_total_relation_size(c.oid) FROM pg_class c WHERE c.oid = to_regclass(:t)"),
+                {"t": name},
+            ).one()
+            out[name] = {"rows": max(rows, 0), "estimated": True, "bytes": size}
+        else:
+            rows = db.execute(select(func.count()).select_from(model)).scalar_one()
+            out[name] = {"rows": rows, "estimated": False, "bytes": None}
+    return out
+
+
+class MaintenanceRunner:
+    """Periodic prune in a background thread (every MAINTENANCE_INTERVAL_MINUTES; 0 disables it)."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        if settings.maintenance_interval_minutes <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> Dict[str, Any]:
+        """Prune now; serialised with the periodic run. Returns what was deleted and how long it took."""
+        with self._lock:
+            started = time.perf_counter()
+            with SessionLocal() as db:
+                pruned = prune_expired(db)
+            result = {
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+                "seconds": round(time.perf_counter() - started, 3),
+                "pruned": pruned,
+            }
+            self.last_run = result
+        if any(pruned.values()):
+            log.info("maintenance pruned %s", pruned)
+        return result
+
+    def _loop(self) -> None:
+        while not self._stop.wait(settings.maintenance_interval_minutes * 60):
+            try:
+                self.run_once()
+            except Exception:
+                log.exception("maintenance run failed")
+
+
+runner = MaintenanceRunner()
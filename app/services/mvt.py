@@ -0,0 +1,144 @@
+# app/services/mvt.py
+"""
+Minimal Mapbox Vector Tile (v2.1) encoder: just what the parcel tiles need
+(points and polygons with string/number attributes), written straight to protobuf
+so there's no extra dependency.
+"""
+from __future__ import annotations
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+POINT = 1
+LINESTRING = 2
+POLYGON = 3
+
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+
+
+# ---------- protobuf wire format ----------
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _key(field_no: int, wire_type: int) -> bytes:
+    return _varint((field_no << 3) | wire_type)
+
+
+def _len_delimited(field_no: int, payload: bytes) -> bytes:
+    return _key(field_no, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field_no: int, values: Sequence[int]) -> bytes:
+    return _len_delimited(field_no, b"".join(_varint(v) for v in values))
+
+
+def _value(v: Any) -> bytes:
+    if isinstance(v, bool):
+        return _key(7, 0) + _varint(int(v))
+    if isinstance(v, int):
+        return _key(6, 0) + _varint(_zigzag(v)) if v < 0 else _key(5, 0) + _varint(v)
+    if isinstance(v, float):
+        return _key(3, 1) + struct.pack("<d", v)
+    return _len_delimited(1, str(v).encode("utf-8"))
+
+
+# ---------- geometry commands ----------
+def _command(cmd: int, count: int) -> int:
+    return (cmd & 0x7) | (count << 3)
+
+
+def encode_point(x: int, y: int) -> list[int]:
+    return [_command(_MOVE_TO, 1), _zigzag(x), _zigzag(y)]
+
+
+def ring_area(ring: Sequence[tuple[int, int]]) -> float:
+    """Shoelace over an open ring, in tile coordinates (y down)."""
+    n = len(ring)
+    return sum(ring[i][0] * ring[(i + 1) % n][1] - ring[(i + 1) % n][0] * ring[i][1] for i in range(n)) / 2.0
+
+
+def encode_polygon(rings: Sequence[Sequence[tuple[int, int]]]) -> list[int]:
+    """
+    Rings are open (no repeated first point), integer tile coordinates.
+    The first ring is the exterior; it's wound to positive area (clockwise on screen),
+    interior rings the other way, as the spec requires.
+    """
+    out: list[int] = []
+    cx = cy = 0
+    for i, ring in enumerate(rings):
+        ring = list(ring)
+        if (ring_area(ring) > 0) != (i == 0):
+            ring.reverse()
+        x0, y0 = ring[0]
+        out += [_command(_MOVE_TO, 1), _zigzag(x0 - cx), _zigzag(y0 - cy)]
+        cx, cy = x0, y0
+        out.append(_command(_LINE_TO, len(ring) - 1))
+        for x, y in ring[1:]:
+            out += [_zigzag(x - cx), _zigzag(y - cy)]
+            cx, cy = x, y
+        out.append(_command(_CLOSE_PATH, 1))
+    return out
+
+
+# ---------- layers ----------
+@dataclass
+class Feature:
+    geom_type: int
+    geometry: list[int]
+    properties: dict[str, Any] = field(default_factory=dict)
+    id: int | None = None
+
+
+@dataclass
+class Layer:
+    name: str
+    features: list[Feature] = field(default_factory=list)
+    extent: int = 4096
+
+    def encode(self) -> bytes:
+        keys: dict[str, int] = {}
+        values: dict[tuple[type, Any], int] = {}
+        feats = bytearray()
+        for f in self.features:
+            tags: list[int] = []
+            for k, v in f.properties.items():
+                if v is None:
+                    continue
+                tags.append(keys.setdefault(k, len(keys)))
+                tags.append(values.setdefault((type(v), v), len(values)))
+            body = bytearray()
+            if f.id is not None:
+                body += _key(1, 0) + _varint(f.id)
+            if tags:
+                body += _packed(2, tags)
+            body += _key(3, 0) + _varint(f.geom_type)
+            body += _packed(4, f.geometry)
+            feats += _len_delimited(2, bytes(body))
+
+        out = bytearray(_key(15, 0) + _varint(2))
+        out += _len_delimited(1, self.name.encode("utf-8"))
+        out += feats
+        for k in keys:
+            out += _len_delimited(3, k.encode("utf-8"))
+        for (_t, v) in values:
+            out += _len_delimited(4, _value(v))
+        out += _key(5, 0) + _varint(self.extent)
+        return bytes(out)
+
+
+def encode_tile(layers: Sequence[Layer]) -> bytes:
+    """Layers without features are left out; a tile with nothing in it is b""."""
+    return b"".join(_len_delimited(3, layer.encode()) for layer in layers if layer.features)
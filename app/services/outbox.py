@@ -0,0 +1,196 @@
+# app/services/outbox.py
+"""
+Transactional outbox for email and SMS.
+
+Request handlers call enqueue_email / enqueue_sms inside their own transaction and
+return; the message becomes visible to the sender only if that transaction commits.
+A background thread claims due rows in batches (FOR UPDATE SKIP LOCKED, so several
+workers can share the table), delivers them over one pooled SMTP connection, and
+reschedules failures with exponential backoff. Delivery is at-least-once: a row
+claimed by a process that dies is retried after OUTBOX_LEASE_SECONDS. SMS carry one-time
+codes, so they are given up once OTP_TTL_MINUTES have passed, and their text is wiped
+as soon as they are sent or failed.
+"""
+from __future__ import annotations
+import logging
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.outbox_message import OutboxChannel, OutboxMessage, OutboxStatus
+from app.services.email import SmtpConnection, build_message, is_transient
+from app.services.sms import send_sms
+
+log = logging.getLogger(__name__)
+
+_WAKE_KEY = "outbox_wake"
+
+
+# ---------- enqueue (caller commits) ----------
+def enqueue_email(db: Session, to: str, subject: str, html: str, text: Optional[str] = None) -> OutboxMessage:
+    msg = OutboxMessage(channel=OutboxChannel.EMAIL, recipient=to, subject=subject, body_html=html, body_text=text)
+    db.add(msg)
+    db.info[_WAKE_KEY] = True
+    return msg
+
+
+def enqueue_sms(db: Session, to: str, body: str) -> OutboxMessage:
+    msg = OutboxMessage(channel=OutboxChannel.SMS, recipient=to, body_text=body)
+    db.add(msg)
+    db.info[_WAKE_KEY] = True
+    return msg
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_WAKE_KEY, False):
+        sender.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_WAKE_KEY, None)
+
+
+# ---------- delivery ----------
+def backoff_seconds(attempts: int) -> float:
+    """Exponential (base * 2^(n-1)), capped, with +-20% jitter so retries don't line up."""
+    delay = min(settings.outbox_backoff_max_seconds, settings.outbox_backoff_base_seconds * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _sms_expiry(row: OutboxMessage) -> datetime:
+    """Our SMS carry one-time codes: delivering one after OTP_TTL_MINUTES is pointless."""
+    created = row.created_at or datetime.now(timezone.utc)
+    if created.tzinfo is None:  # sqlite hands back naive UTC
+        created = created.replace(tzinfo=timezone.utc)
+    return created + timedelta(minutes=settings.otp_ttl_minutes)
+
+
+def _claim(db: Session, now: datetime) -> list[dict]:
+    """Lease up to a batch of due rows; returns plain dicts (the rows are committed before sending)."""
+    rows = db.execute(
+        select(OutboxMessage)
+        .where(OutboxMessage.status == OutboxStatus.PENDING, OutboxMessage.next_attempt_at <= now)
+        .order_by(OutboxMessage.id)
+        .limit(settings.outbox_batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    claimed = []
+    for row in rows:
+        row.attempts += 1
+        row.next_attempt_at = now + timedelta(seconds=settings.outbox_lease_seconds)
+        claimed.append({
+            "id": row.id, "channel": row.channel, "recipient": row.recipient, "subject": row.subject,
+            "body_html": row.body_html, "body_text": row.body_text, "attempts": row.attempts,
+            "expires_at": _sms_expiry(row) if row.channel == OutboxChannel.SMS else None,
+        })
+    db.commit()
+    return claimed
+
+
+class OutboxSender:
+    """Background delivery loop; one per process (started from app startup when OUTBOX_ENABLED)."""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._smtp = SmtpConnection()
+        self._lock = threading.Lock()
+        self._counts = {"sent": 0, "retried": 0, "failed": 0}
+        self._batches = 0
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="outbox-sender", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    # ---------- work ----------
+    def _deliver(self, msg: dict) -> None:
+        if msg["channel"] == OutboxChannel.SMS:
+            send_sms(msg["recipient"], msg["body_text"] or "")
+        else:
+            self._smtp.send(build_message(msg["recipient"], msg["subject"] or "", msg["body_html"], msg["body_text"]))
+
+    def run_once(self) -> int:
+        """Claim and deliver one batch; returns how many rows were claimed."""
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            batch = _claim(db, now)
+            if not batch:
+                return 0
+            for msg in batch:
+                values: Dict[str, Any]
+                expires_at = msg["expires_at"]
+                try:
+                    if expires_at is not None and datetime.now(timezone.utc) >= expires_at:
+                        raise TimeoutError("code expired before it could be delivered")
+                    self._deliver(msg)
+                    values = {"status": OutboxStatus.SENT, "sent_at": datetime.now(timezone.utc), "last_error": None}
+                    outcome = "sent"
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"[:2000]
+                    retry_at = datetime.now(timezone.utc) + timedelta(seconds=backoff_seconds(msg["attempts"]))
+                    if (
+                        is_transient(e)
+                        and msg["attempts"] < settings.outbox_max_attempts
+                        and (expires_at is None or retry_at < expires_at)
+                    ):
+                        values = {"next_attempt_at": retry_at, "last_error": error}
+                        outcome = "retried"
+                    else:
+                        values = {"status": OutboxStatus.FAILED, "last_error": error}
+                        outcome = "failed"
+                    log.warning("outbox message %s %s: %s", msg["id"], outcome, error)
+                if msg["channel"] == OutboxChannel.SMS and outcome != "retried":
+                    values["body_text"] = None  # carries a one-time code; don't keep it once we're done with it
+                db.execute(update(OutboxMessage).where(OutboxMessage.id == msg["id"]).values(**values))
+                db.commit()
+                with self._lock:
+                    self._counts[outcome] += 1
+        with self._lock:
+            self._batches += 1
+        return len(batch)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.run_once() >= settings.outbox_batch_size:
+                    continue  # more are probably due; don't wait
+            except Exception:
+                log.exception("outbox sender iteration failed")
+            self._smtp.close_if_idle()
+            self._wake.wait(settings.outbox_poll_seconds)
+            self._wake.clear()
+        self._smtp.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "batches": self._batches,
+                **self._counts,
+            }
+
+
+sender = OutboxSender()
@@ -0,0 +1,247 @@
+# app/services/overlaps.py
+from __future__ import annotations
+import logging
+import math
+from typing import Sequence
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, load_only
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.property import Property
+from app.models.property_overlap import PropertyOverlap
+from app.services.property_geometry import bbox_intersects
+
+log = logging.getLogger(__name__)
+
+Point = tuple[float, float]
+
+_EPS = 1e-7  # metres; parcels are surveyed to the centimetre at best
+_WGS84_A = 6378137.0
+_WGS84_E2 = 0.00669437999014
+
+
+# ---------- planar geometry (local metres) ----------
+def _local_projector(lon0: float, lat0: float):
+    """lon/lat -> metres east/north of (lon0, lat0) using the ellipsoid's radii of curvature there."""
+    s = math.sin(math.radians(lat0))
+    w = 1 - _WGS84_E2 * s * s
+    n = _WGS84_A / math.sqrt(w)
+    m = _WGS84_A * (1 - _WGS84_E2) / (w * math.sqrt(w))
+    kx = math.radians(1) * n * math.cos(math.radians(lat0))
+    ky = math.radians(1) * m
+    return lambda lon, lat: ((lon - lon0) * kx, (lat - lat0) * ky)
+
+
+def _signed_area(ring: Sequence[Point]) -> float:
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:])) / 2.0
+
+
+def _ccw(ring: list[Point]) -> list[Point]:
+    """Closed ring, counter-clockwise."""
+    if ring[0] != ring[-1]:
+        ring = ring + [ring[0]]
+    return ring if _signed_area(ring) >= 0 else ring[::-1]
+
+
+def _cross(ox, oy, ax, ay, bx, by) -> float:
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def _edge_params(p: Point, q: Point, other: Sequence[Point]) -> list[float]:
+    """Parameters t in [0, 1] along p->q where it meets an edge of `other` (crossings and collinear overlaps)."""
+    ts = [0.0, 1.0]
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    length2 = dx * dx + dy * dy
+    if length2 == 0:
+        return ts
+    for r, s in zip(other, other[1:]):
+        ex, ey = s[0] - r[0], s[1] - r[1]
+        denom = dx * ey - dy * ex
+        if abs(denom) > _EPS * math.sqrt(length2 * (ex * ex + ey * ey)):
+            t = ((r[0] - p[0]) * ey - (r[1] - p[1]) * ex) / denom
+            u = ((r[0] - p[0]) * dy - (r[1] - p[1]) * dx) / denom
+            if -1e-12 <= t <= 1 + 1e-12 and -1e-12 <= u <= 1 + 1e-12:
+                ts.append(min(1.0, max(0.0, t)))
+        elif abs(_cross(p[0], p[1], q[0], q[1], r[0], r[1])) <= _EPS * math.sqrt(length2):
+            # Collinear: the other edge's endpoints split this one
+            for v in (r, s):
+                t = ((v[0] - p[0]) * dx + (v[1] - p[1]) * dy) / length2
+                if 0.0 < t < 1.0:
+                    ts.append(t)
+    return sorted(set(ts))
+
+
+def _on_edge(pt: Point, r: Point, s: Point) -> bool:
+    ex, ey = s[0] - r[0], s[1] - r[1]
+    length = math.hypot(ex, ey)
+    if length == 0:
+        return math.hypot(pt[0] - r[0], pt[1] - r[1]) <= _EPS
+    if abs(_cross(r[0], r[1], s[0], s[1], pt[0], pt[1])) > _EPS * length:
+        return False
+    t = ((pt[0] - r[0]) * ex + (pt[1] - r[1]) * ey) / (length * length)
+    return -1e-12 <= t <= 1 + 1e-12
+
+
+def _inside(pt: Point, ring: Sequence[Point]) -> bool:
+    """Even-odd ray cast; callers have already ruled out points on the boundary."""
+    x, y = pt
+    inside = False
+    for (x0, y0), (x1, y1) in zip(ring, ring[1:]):
+        if (y0 > y) != (y1 > y):
+            if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+    return inside
+
+
+def _boundary_integral(a: Sequence[Point], b: Sequence[Point], keep_shared: bool) -> float:
+    """
+    Sum of (x dy - y dx) / 2 over the parts of a's boundary that lie inside b.
+    Pieces lying on b's boundary count only when keep_shared and both run the same way
+    (so shared edges of A∩B are counted exactly once, and edges of side-by-side parcels cancel).
+    """
+    total = 0.0
+    for p, q in zip(a, a[1:]):
+        ts = _edge_params(p, q, b)
+        for t0, t1 in zip(ts, ts[1:]):
+            if t1 - t0 <= 1e-12:
+                continue
+            p0 = (p[0] + (q[0] - p[0]) * t0, p[1] + (q[1] - p[1]) * t0)
+            p1 = (p[0] + (q[0] - p[0]) * t1, p[1] + (q[1] - p[1]) * t1)
+            mid = ((p0[0] + p1[0]) / 2, (p0[1] + p1[1]) / 2)
+            shared = [(r, s) for r, s in zip(b, b[1:]) if _on_edge(mid, r, s)]
+            if shared:
+                if not keep_shared:
+                    continue
+                r, s = shared[0]
+                if (p1[0] - p0[0]) * (s[0] - r[0]) + (p1[1] - p0[1]) * (s[1] - r[1]) <= 0:
+                    continue
+            elif not _inside(mid, b):
+                continue
+            total += (p0[0] * p1[1] - p1[0] * p0[1]) / 2.0
+    return total
+
+
+def intersection_area(ring_a: Sequence[Point], ring_b: Sequence[Point]) -> float:
+    """
+    Exact area of the intersection of two simple polygons (planar coordinates), via Green's
+    theorem: the boundary of A∩B is (∂A inside B) + (∂B inside A).
+    """
+    a, b = _ccw(list(ring_a)), _ccw(list(ring_b))
+    area = _boundary_integral(a, b, keep_shared=True) + _boundary_integral(b, a, keep_shared=False)
+    return max(0.0, area)
+
+
+# ---------- property overlaps ----------
+def find_overlaps(db: Session, prop: Property) -> list[dict]:
+    """
+    Overlaps between `prop` and the same owner's other parcels: bbox candidates from the
+    spatial index, then exact intersection in a local metric plane around `prop`.
+    """
+    if prop.geom_polygon is None:
+        return []
+    candidates = db.execute(
+        select(Property)
+        .options(load_only(Property.id, Property.title_number, Property.geom_polygon, Property.area_m2))
+        .where(
+            Property.user_id == prop.user_id,
+            Property.id != prop.id,
+            bbox_intersects(
+                db.get_bind().dialect.name,
+                prop.bbox_min_lon, prop.bbox_min_lat, prop.bbox_max_lon, prop.bbox_max_lat,
+            ),
+        )
+    ).scalars().all()
+    if not candidates:
+        return []
+
+    project = _local_projector(prop.centroid_lon, prop.centroid_lat)
+    mine = [project(lon, lat) for lon, lat in prop.geom_polygon]
+    my_area = abs(_signed_area(_ccw(mine)))
+
+    found = []
+    for other in candidates:
+        theirs = [project(lon, lat) for lon, lat in other.geom_polygon]
+        area = intersection_area(mine, theirs)
+        if area < settings.overlap_min_area_m2:
+            continue
+        their_area = abs(_signed_area(_ccw(theirs)))
+        found.append({
+            "other_property_id": other.id,
+            "other_title_number": other.title_number,
+            "overlap_area_m2": area,
+            "overlap_ratio": area / my_area if my_area else 0.0,
+            "other_overlap_ratio": area / their_area if their_area else 0.0,
+        })
+    return found
+
+
+def _upsert_overlaps(db: Session, rows: list[dict]) -> None:
+    """
+    INSERT ... ON CONFLICT (property_id, other_property_id) DO UPDATE where the dialect has it:
+    a concurrent check of the other property may have stored the same pair since our delete.
+    Rows go in key order so two such checks take the row locks in the same order.
+    """
+    rows = sorted(rows, key=lambda r: (r["property_id"], r["other_property_id"]))
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(db.get_bind().dialect.name)
+    if dialect is None:
+        db.execute(insert(PropertyOverlap), rows)
+        return
+    stmt = dialect.insert(PropertyOverlap).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[PropertyOverlap.property_id, PropertyOverlap.other_property_id],
+        set_={
+            "overlap_area_m2": stmt.excluded.overlap_area_m2,
+            "overlap_ratio": stmt.excluded.overlap_ratio,
+            "detected_at": func.now(),
+        },
+    ))
+
+
+def refresh_overlaps(db: Session, property_id: int) -> list[dict]:
+    """
+    Recompute and store (both directions) the overlaps involving one property. Commits.
+    Safe to run concurrently for two properties of the same pair (background check after
+    PUT /boundaries vs. POST /overlaps/check): the old rows are locked in id order before
+    they go, and the new ones are upserted, so neither side fails on uq_property_overlap_pair.
+    """
+    prop = db.get(Property, property_id, populate_existing=True)  # all columns, whatever profile loaded it
+    if prop is None:
+        return []
+    found = find_overlaps(db, prop)
+
+    involving = or_(PropertyOverlap.property_id == property_id, PropertyOverlap.other_property_id == property_id)
+    stale = db.execute(
+        select(PropertyOverlap.id).where(involving).order_by(PropertyOverlap.id).with_for_update()
+    ).scalars().all()
+    if stale:
+        db.execute(delete(PropertyOverlap).where(PropertyOverlap.id.in_(stale)))
+    rows = []
+    for o in found:
+        rows.append({"property_id": property_id, "other_property_id": o["other_property_id"],
+                     "overlap_area_m2": o["overlap_area_m2"], "overlap_ratio": o["overlap_ratio"]})
+        rows.append({"property_id": o["other_property_id"], "other_property_id": property_id,
+                     "overlap_area_m2": o["overlap_area_m2"], "overlap_ratio": o["other_overlap_ratio"]})
+    if rows:
+        _upsert_overlaps(db, rows)
+    db.commit()
+    return found
+
+
+def run_overlap_check(property_id: int) -> None:
+    """Background-task entry point (after the request's session is gone)."""
+    try:
+        with SessionLocal() as db:
+            found = refresh_overlaps(db, property_id)
+        if found:
+            log.info("property %s overlaps %s", property_id, [o["other_property_id"] for o in found])
+    except Exception:
+        log.exception("overlap check failed for property %s", property_id)
+
+
+def run_overlap_checks(property_ids: Sequence[int]) -> None:
+    """run_overlap_check for each property whose stored geometry was just recomputed."""
+    for property_id in property_ids:
+        run_overlap_check(property_id)
@@ -15,19 +15,32 @@ _BEARING_RX = re.compile(
 )
 
 
+def _bearing_from_match(m: re.Match) -> Dict:
+    b = m.groupdict()
+    return {
+        "ns": b["ns"].upper(),
+        "degrees": int(b["deg"]),
+        "minutes": int(b["min"]),
+        "seconds": float(b["sec"]) if b.get("sec") else None,
+        "ew": b["ew"].upper() if b.get("ew") else None,
+    }
+
+
+def parse_bearing(text: str) -> Optional[Dict]:
+    """
+    Parse a stored bearing string like "N 45° 30' E" into
+    {"ns", "degrees", "minutes", "seconds", "ew"}; None if it doesn't look like one.
+    """
+    m_b = _BEARING_RX.search((text or "").strip())
+    return _bearing_from_match(m_b) if m_b else None
+
+
 def parse_segment(seg: str) -> Tuple[Optional[Dict], Optional[float]]:
     seg_clean = seg.strip().rstrip(',:;.')
     m_b = _BEARING_RX.search(seg_clean)
     if not m_b:
         return None, None
 
-    b = m_b.groupdict()
-    ns = b["ns"].upper()
-    deg = int(b["deg"])
-    mn = int(b["min"])
-    sc = float(b["sec"]) if b.get("sec") else None
-    ew = b["ew"].upper() if b.get("ew") else None
-
     # Distance after the bearing
     post = seg_clean[m_b.end():]
     m_dist = re.search(r'(?P<dist>[\d\.]+)\s*m', post, flags=re.IGNORECASE)
@@ -35,7 +48,7 @@ def parse_segment(seg: str) -> Tuple[Optional[Dict], Optional[float]]:
         raise ValueError(f"Could not parse distance in segment: {seg_clean!r}")
     dist = float(m_dist.group("dist"))
 
-    return {"ns": ns, "degrees": deg, "minutes": mn, "seconds": sc, "ew": ew}, dist
+    return _bearing_from_match(m_b), dist
 
 
 # ---------------- Title/Owner heuristics (optional) ----------------
@@ -0,0 +1,172 @@
+# app/services/property_geometry.py
+from __future__ import annotations
+import math
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.db.session import SessionLocal
+from app.models.property import Property
+from app.models.property_boundary import PropertyBoundary
+from app.models.tie_point import TiePoint
+from app.services.geodesy import bearing_azimuth, next_point, polygon_area_m2, prs92_zone3_to_wgs84
+from app.services.parsing import parse_bearing
+
+GEOMETRY_COLUMNS = (
+    "geom_polygon", "centroid_lon", "centroid_lat",
+    "bbox_min_lon", "bbox_min_lat", "bbox_max_lon", "bbox_max_lat", "area_m2",
+)
+
+_CLOSE_EPS_DEG = 5e-6  # ~0.5 m: a traverse closing within this is snapped shut
+
+
+def bbox_box(min_lon, min_lat, max_lon, max_lat):
+    return func.box(func.point(min_lon, min_lat), func.point(max_lon, max_lat))
+
+
+def bbox_intersects(dialect: str, west: float, south: float, east: float, north: float):
+    """
+    WHERE clause: the stored bbox overlaps the given viewport. On Postgres this is
+    `box && box` on the same expression as ix_properties_bbox_gist; elsewhere plain comparisons.
+    """
+    if dialect == "postgresql":
+        stored = bbox_box(Property.bbox_min_lon, Property.bbox_min_lat, Property.bbox_max_lon, Property.bbox_max_lat)
+        return stored.op("&&")(bbox_box(west, south, east, north))
+    return and_(
+        Property.bbox_min_lon <= east,
+        Property.bbox_max_lon >= west,
+        Property.bbox_min_lat <= north,
+        Property.bbox_max_lat >= south,
+    )
+
+
+def tie_point_lonlat(tp: TiePoint | None) -> Optional[tuple[float, float]]:
+    if tp is None or tp.easting is None or tp.northing is None:
+        return None
+    return prs92_zone3_to_wgs84().transform(tp.easting, tp.northing)
+
+
+def _leg(b: PropertyBoundary) -> Optional[tuple[float, float]]:
+    """(azimuth, distance) from stored components, falling back to parsing the bearing string."""
+    if b.ns is not None and b.degrees is not None and b.minutes is not None:
+        return bearing_azimuth(b.ns, b.degrees, b.minutes, b.seconds, b.ew), b.distance_m
+    parsed = parse_bearing(b.bearing)
+    if not parsed:
+        return None
+    return bearing_azimuth(parsed["ns"], parsed["degrees"], parsed["minutes"], parsed["seconds"], parsed["ew"]), b.distance_m
+
+
+def traverse(lon: float, lat: float, legs: Iterable[tuple[float, float]]) -> list[list[float]]:
+    """Corner points ([lon, lat]) reached by walking each leg from the tie point (same as /v1/geometry/boundaries)."""
+    out = []
+    for theta, dist in legs:
+        lat, lon = next_point(lat, lon, theta, dist)
+        out.append([lon, lat])
+    return out
+
+
+def _centroid(ring: Sequence[Sequence[float]]) -> tuple[float, float]:
+    """Area centroid of a closed ring, in a local equirectangular plane (parcel-sized, so flat is fine)."""
+    k = math.cos(math.radians(ring[0][1]))
+    a2 = cx = cy = 0.0
+    for (x0, y0), (x1, y1) in zip(ring, ring[1:]):
+        x0, x1 = x0 * k, x1 * k
+        cross = x0 * y1 - x1 * y0
+        a2 += cross
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+    if abs(a2) < 1e-18:  # degenerate: fall back to the vertex mean
+        pts = ring[:-1]
+        return sum(p[0] for p in pts) / len(pts), sum(p[1] for p in pts) / len(pts)
+    return cx / (3 * a2) / k, cy / (3 * a2)
+
+
+def compute_geometry(tp: TiePoint | None, boundaries: Sequence[PropertyBoundary]) -> Optional[dict]:
+    """Column values for a property's stored geometry, or None if it can't be derived."""
+    origin = tie_point_lonlat(tp)
+    legs = [_leg(b) for b in boundaries]
+    if origin is None or not legs or any(leg is None for leg in legs):
+        return None
+
+    ring = traverse(origin[0], origin[1], legs)
+    if abs(ring[0][0] - ring[-1][0]) > _CLOSE_EPS_DEG or abs(ring[0][1] - ring[-1][1]) > _CLOSE_EPS_DEG:
+        ring.append(list(ring[0]))
+    else:
+        ring[-1] = list(ring[0])
+    if len(ring) < 4:  # fewer than 3 distinct corners
+        return None
+
+    lons = [p[0] for p in ring]
+    lats = [p[1] for p in ring]
+    c_lon, c_lat = _centroid(ring)
+    return {
+        "geom_polygon": ring,
+        "centroid_lon": c_lon,
+        "centroid_lat": c_lat,
+        "bbox_min_lon": min(lons),
+        "bbox_min_lat": min(lats),
+        "bbox_max_lon": max(lons),
+        "bbox_max_lat": max(lats),
+        "area_m2": polygon_area_m2(ring[:-1]),
+    }
+
+
+def apply_geometry(prop: Property, tp: TiePoint | None, boundaries: Sequence[PropertyBoundary]) -> None:
+    """Recompute and assign the stored geometry columns (all NULL when not derivable)."""
+    values = compute_geometry(tp, boundaries) or {}
+    for col in GEOMETRY_COLUMNS:
+        setattr(prop, col, values.get(col))
+
+
+def _recompute(db: Session, where, batch_size: int) -> list[int]:
+    """Recompute in id-keyset batches; returns the ids of the properties touched."""
+    done: list[int] = []
+    last_id = 0
+    while True:
+        props = db.execute(
+            select(Property)
+            .options(selectinload(Property.boundaries), selectinload(Property.tie_point))
+            .where(where, Property.id > last_id)
+            .order_by(Property.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not props:
+            return done
+        for prop in props:
+            apply_geometry(prop, prop.tie_point, prop.boundaries)
+        db.commit()
+        done.extend(p.id for p in props)
+        last_id = props[-1].id
+        db.expunge_all()
+
+
+def recompute_for_tie_points(db: Session, tie_point_ids: Iterable[int], *, batch_size: int = 500) -> list[int]:
+    """Refresh stored geometry of every property anchored on the given tie points. Commits per batch."""
+    ids = list(set(tie_point_ids))
+    if not ids:
+        return []
+    return _recompute(db, Property.tie_point_id.in_(ids), batch_size)
+
+
+def recompute_for_properties(db: Session, property_ids: Iterable[int], *, batch_size: int = 500) -> list[int]:
+    """Refresh stored geometry of the given properties (edited outside the API, e.g. the admin UI)."""
+    ids = list(set(property_ids))
+    if not ids:
+        return []
+    return _recompute(db, Property.id.in_(ids), batch_size)
+
+
+def recompute_detached(*, property_ids: Iterable[int] = (), tie_point_ids: Iterable[int] = ()) -> list[int]:
+    """
+    recompute_for_properties + recompute_for_tie_points on a session of its own. Blocking
+    (DB round-trips, projections, geodesic areas): async callers run it via asyncio.to_thread.
+    """
+    with SessionLocal() as db:
+        done = recompute_for_properties(db, property_ids) + recompute_for_tie_points(db, tie_point_ids)
+    return list(dict.fromkeys(done))
+
+
+def backfill_missing(db: Session, *, batch_size: int = 500) -> list[int]:
+    """Compute geometry for properties stored before it was kept (or whose inputs were incomplete)."""
+    return _recompute(db, Property.geom_polygon.is_(None), batch_size)
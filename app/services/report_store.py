@@ -0,0 +1,124 @@
+# app/services/report_store.py
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.property_report import PropertyReport
+from app.services.report_template import TEMPLATE_VERSION
+
+BLOB_DIR = os.path.join(settings.reports_dir, "blobs")
+
+
+def report_key(
+    *,
+    property_id: int | None,
+    title_number: str | None,
+    owner: str | None,
+    boundaries: Iterable[dict],
+    snapshot_url: str | None,
+) -> str:
+    """sha256 over everything that influences the rendered PDF (plus the template version)."""
+    doc = {
+        "v": TEMPLATE_VERSION,
+        "property_id": property_id,
+        "title_number": title_number,
+        "owner": owner,
+        "boundaries": [
+            [b.get("ns"), b.get("deg"), b.get("min"), b.get("ew"), b.get("distance")] for b in boundaries
+        ],
+        "snapshot": snapshot_url,
+    }
+    raw = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def combined_key(keys: Iterable[str]) -> str:
+    """Key for a merged (multi-property) report."""
+    return hashlib.sha256(("merged:" + ",".join(keys)).encode("ascii")).hexdigest()
+
+
+def blob_path(key: str) -> str:
+    return os.path.join(BLOB_DIR, key[:2], f"{key}.pdf")
+
+
+def write_blob(key: str, data: bytes) -> str:
+    """Write the blob atomically (tmp + rename). Identical content may already be there; that's fine."""
+    path = blob_path(key)
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def find_existing(db: Session, property_id: int, key: str) -> PropertyReport | None:
+    """Latest report row for this property with identical inputs whose blob is still on disk."""
+    row = db.execute(
+        select(PropertyReport)
+        .where(PropertyReport.property_id == property_id, PropertyReport.content_hash == key)
+        .order_by(PropertyReport.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    if row and row.file_path and os.path.exists(row.file_path):
+        return row
+    return None
+
+
+def find_existing_many(db: Session, keys: dict[int, str]) -> dict[int, PropertyReport]:
+    """find_existing for several properties in one query: {property_id: row} for those that have one."""
+    if not keys:
+        return {}
+    rows = db.execute(
+        select(PropertyReport)
+        .where(PropertyReport.property_id.in_(keys), PropertyReport.content_hash.in_(set(keys.values())))
+        .order_by(PropertyReport.id.desc())
+    ).scalars()
+    found: dict[int, PropertyReport] = {}
+    for row in rows:
+        if row.property_id in found or row.content_hash != keys[row.property_id]:
+            continue
+        if row.file_path and os.path.exists(row.file_path):
+            found[row.property_id] = row
+    return found
+
+
+def prune_unreferenced_blobs(db: Session, *, min_age_seconds: int | None = None) -> dict:
+    """
+    Delete PDFs under REPORTS_DIR that no PropertyReport row points at.
+    Files younger than `min_age_seconds` are kept so an in-flight render
+    (file written, row not yet committed) is never collected.
+    """
+    grace = settings.report_gc_grace_seconds if min_age_seconds is None else min_age_seconds
+    referenced = {os.path.abspath(p) for p in db.execute(select(PropertyReport.file_path)).scalars() if p}
+    cutoff = time.time() - grace
+
+    scanned = deleted = freed = 0
+    for root, _dirs, files in os.walk(settings.reports_dir):
+        for name in files:
+            if not (name.endswith(".pdf") or name.endswith(".tmp")):
+                continue
+            path = os.path.abspath(os.path.join(root, name))
+            scanned += 1
+            if path in referenced:
+                continue
+            try:
+                st = os.stat(path)
+                if st.st_mtime > cutoff:
+                    continue
+                os.remove(path)
+            except OSError:
+                continue
+            deleted += 1
+            freed += st.st_size
+    return {"scanned": scanned, "deleted": deleted, "bytes_freed": freed}
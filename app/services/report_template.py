@@ -0,0 +1,159 @@
+# app/services/report_template.py
+from __future__ import annotations
+import os
+import threading
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from reportlab.platypus import TableStyle
+
+from app.core.config import settings
+
+# Bump whenever the rendered layout changes (used to key cached/stored reports).
+TEMPLATE_VERSION = "2"
+
+# ---------- layout constants ----------
+MARGIN = 28
+LOGO_MAX_H = 55  # points
+LOGO_MAX_W = 72  # points (to prevent super-wide logos)
+RULE_COLOR = colors.HexColor("#CFCFCF")
+GRID_COLOR = colors.HexColor("#B0B0B0")
+
+
+class ReportTemplate:
+    """
+    Everything about the report that does not depend on the request:
+    the decoded logo, paragraph styles, table styles and the header geometry.
+    Built once per process (see get_report_template) and shared read-only by
+    every render thread.
+    """
+
+    def __init__(self, logo_path: str | None, page_size=A4):
+        self.logo_path = logo_path
+        self.logo_mtime = _mtime(logo_path)
+        self.page_w, self.page_h = page_size
+
+        # --- styles ---
+        styles = getSampleStyleSheet()
+        self.label_style = ParagraphStyle("label", parent=styles["Normal"], fontName="Helvetica-Bold", fontSize=10)
+        self.value_style = ParagraphStyle("value", parent=styles["Normal"], fontName="Helvetica", fontSize=10, leading=13)
+        self.heading_style = ParagraphStyle(
+            "heading", parent=styles["Normal"], fontName="Helvetica-Bold", fontSize=12, leading=14,
+            spaceAfter=6,
+        )
+        self.note_style = ParagraphStyle("note", parent=styles["Normal"], fontName="Helvetica", fontSize=9)
+
+        self.summary_table_style = TableStyle([
+            ("GRID", (0, 0), (-1, -1), 0.5, GRID_COLOR),
+            ("BACKGROUND", (0, 0), (0, -1), colors.lightblue),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ])
+        self.boundaries_table_style = TableStyle([
+            ("GRID", (0, 0), (-1, -1), 0.5, GRID_COLOR),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightblue),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ])
+
+        # --- header geometry ---
+        band_top = self.page_h - 28
+        band_bottom = self.page_h - 70
+        center_y = band_bottom + (band_top - band_bottom) / 2
+        self.title_y = center_y + 3  # baseline ~ a bit above center
+        self.separator_y = self.page_h - 90
+        self.text_x = MARGIN  # shifts right if a logo exists
+
+        # --- flowable frame (content area between header separator and footer) ---
+        self.top_margin = (self.page_h - self.separator_y) + 15
+        self.bottom_margin = 36
+        self.frame_h = self.page_h - self.top_margin - self.bottom_margin
+
+        # --- logo (decoded once) ---
+        self.logo: ImageReader | None = None
+        self.logo_box: tuple[float, float, float, float] | None = None  # x, y, w, h
+        logo = _load_logo(logo_path)
+        if logo:
+            iw, ih = logo.getSize()
+            scale = min(LOGO_MAX_W / iw, LOGO_MAX_H / ih)
+            w = max(1, iw * scale)
+            h = max(1, ih * scale)
+            self.logo = logo
+            self.logo_box = (MARGIN, center_y - (h / 2), w, h)
+            self.text_x = MARGIN + w + 15  # gap to the right of the logo
+
+    def is_stale(self, logo_path: str | None) -> bool:
+        return logo_path != self.logo_path or _mtime(logo_path) != self.logo_mtime
+
+    def draw_header(self, c: canvas.Canvas) -> float:
+        """
+        Draw header with (optional) logo on the left and text on the right.
+        Returns the y-position of the header separator.
+        """
+        if self.logo and self.logo_box:
+            x, y, w, h = self.logo_box
+            c.drawImage(self.logo, x, y, width=w, height=h, preserveAspectRatio=True, mask='auto')
+
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(self.text_x, self.title_y, "LAND TRACKER SUMMARY REPORT")
+
+        c.setFont("Helvetica", 9)
+        c.drawString(self.text_x, self.title_y - 15, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+        # separator under header
+        c.saveState()
+        c.setStrokeColor(RULE_COLOR)
+        c.setLineWidth(1)
+        c.line(MARGIN, self.separator_y, self.page_w - MARGIN, self.separator_y)
+        c.restoreState()
+        return self.separator_y
+
+    def decorate_page(self, c: canvas.Canvas, doc) -> None:
+        """platypus onPage hook: header on top, page number in the footer."""
+        c.saveState()
+        self.draw_header(c)
+        c.setFont("Helvetica", 8)
+        c.drawRightString(self.page_w - MARGIN, 18, f"Page {doc.page}")
+        c.restoreState()
+
+
+def _mtime(path: str | None) -> float | None:
+    try:
+        return os.stat(path).st_mtime if path else None
+    except OSError:
+        return None
+
+
+def _load_logo(path: str | None) -> ImageReader | None:
+    try:
+        if path and os.path.exists(path):
+            logo = ImageReader(path)
+            logo.getRGBData()  # decode now so render threads only ever read the cached pixels
+            return logo
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+_template: ReportTemplate | None = None
+_template_lock = threading.Lock()
+
+
+def get_report_template() -> ReportTemplate:
+    """
+    Return the process-wide template, rebuilding it when `lt_logo_path`
+    (or the file it points at) changes.
+    """
+    global _template
+    path = settings.lt_logo_path
+    tpl = _template
+    if tpl is None or tpl.is_stale(path):
+        with _template_lock:
+            tpl = _template
+            if tpl is None or tpl.is_stale(path):
+                tpl = _template = ReportTemplate(path)
+    return tpl
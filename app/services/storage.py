@@ -0,0 +1,139 @@
+# app/services/storage.py
+from __future__ import annotations
+import base64
+import binascii
+import os
+import re
+import uuid
+from typing import BinaryIO, Iterable
+
+# Peak memory per upload is about one chunk (decoded + encoded), never the whole file.
+B64_CHUNK_CHARS = 256 * 1024
+COPY_CHUNK_BYTES = 256 * 1024
+
+DATA_URL_HEADER_RE = re.compile(r"^data:(?P<mime>[\w\-\./\+]+);base64,", re.I)
+_HEADER_SCAN = 256  # the MIME header is always near the start
+# Like a non-validating b64decode: line breaks (wrapped / trailing newline from mobile clients) are skipped
+_NON_B64_RE = re.compile(r"[^A-Za-z0-9+/=]+")
+
+EXT_BY_MIME = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/webp": ".webp",
+    "application/pdf": ".pdf",
+}
+
+
+class UploadRejected(ValueError):
+    """The payload is malformed or of a type the caller does not accept."""
+
+
+def sniff_mime(head: bytes) -> str | None:
+    """MIME type from magic bytes (only the types we store)."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    return None
+
+
+def _target_path(folder: str, mime: str, filename: str | None) -> str:
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, filename or f"{uuid.uuid4().hex}{EXT_BY_MIME.get(mime, '.bin')}")
+
+
+def _write_atomic(path: str, chunks: Iterable[bytes]) -> str:
+    """Write chunks to a temp file next to `path`, fsync, then rename into place."""
+    tmp = f"{path}.{uuid.uuid4().hex}.part"
+    try:
+        with open(tmp, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def _normalize_allowed(allowed_mimes: set[str]) -> set[str]:
+    return {x.lower() for x in allowed_mimes}
+
+
+def save_data_url(
+    data_url: str,
+    folder: str,
+    *,
+    allowed_mimes: set[str],
+    filename: str | None = None,
+) -> str:
+    """
+    Validate the `data:<mime>;base64,` header and decode the payload in fixed-size
+    chunks straight into a temp file, then fsync + atomic rename. Returns the final path.
+    Characters outside the base64 alphabet (newlines from wrapped payloads) are ignored.
+    """
+    m = DATA_URL_HEADER_RE.match((data_url or "")[:_HEADER_SCAN])
+    if not m:
+        raise UploadRejected("Invalid data URL")
+    mime = m.group("mime").lower()
+    if mime not in _normalize_allowed(allowed_mimes):
+        raise UploadRejected(f"Unsupported MIME type: {mime}")
+    start = m.end()
+    if start >= len(data_url):
+        raise UploadRejected("Invalid base64 payload")
+
+    def _decoded():
+        carry, yielded = "", False
+        for i in range(start, len(data_url), B64_CHUNK_CHARS):
+            chunk = carry + _NON_B64_RE.sub("", data_url[i:i + B64_CHUNK_CHARS])
+            cut = len(chunk) - len(chunk) % 4  # decode whole quanta; the rest waits for the next chunk
+            carry = chunk[cut:]
+            if cut:
+                yield base64.b64decode(chunk[:cut], validate=True)
+                yielded = True
+        if carry or not yielded:
+            # incomplete padding, or nothing decodable at all
+            raise UploadRejected("Invalid base64 payload")
+
+    path = _target_path(folder, mime, filename)
+    try:
+        return _write_atomic(path, _decoded())
+    except (binascii.Error, ValueError):
+        raise UploadRejected("Invalid base64 payload")
+
+
+def save_stream(
+    src: BinaryIO,
+    folder: str,
+    *,
+    allowed_mimes: set[str],
+    filename: str | None = None,
+) -> str:
+    """
+    Copy a binary upload (e.g. UploadFile.file) to disk in fixed-size chunks.
+    The type is taken from the file's magic bytes, not the client's Content-Type.
+    """
+    head = src.read(COPY_CHUNK_BYTES)
+    mime = sniff_mime(head)
+    if not mime or mime not in _normalize_allowed(allowed_mimes):
+        raise UploadRejected(f"Unsupported file type: {mime or 'unknown'}")
+
+    def _chunks():
+        yield head
+        while True:
+            chunk = src.read(COPY_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+    return _write_atomic(_target_path(folder, mime, filename), _chunks())
@@ -0,0 +1,166 @@
+# app/services/tiles.py
+from __future__ import annotations
+import hashlib
+import math
+import threading
+from typing import Sequence
+
+from cachetools import TTLCache
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, load_only
+
+from app.core.config import settings
+from app.models.property import Property
+from app.models.tie_point import TiePoint
+from app.services import mvt
+from app.services.property_geometry import bbox_intersects, tie_point_lonlat
+
+EXTENT = 4096
+BUFFER = 64  # tile units around the edge, so strokes don't get cut at tile seams
+MAX_ZOOM = 24
+
+_CACHE: TTLCache = TTLCache(maxsize=settings.tile_cache_size, ttl=settings.tile_cache_ttl_seconds)
+_CACHE_LOCK = threading.Lock()
+
+
+# ---------- tile math (Web Mercator / XYZ) ----------
+def tile_bounds(z: int, x: int, y: int, buffer: int = 0) -> tuple[float, float, float, float]:
+    """(west, south, east, north) in degrees, optionally grown by `buffer` tile units."""
+    n = 2 ** z
+    pad = buffer / EXTENT
+
+    def lon(tx):
+        return tx / n * 360.0 - 180.0
+
+    def lat(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return lon(x - pad), lat(y + 1 + pad), lon(x + 1 + pad), lat(y - pad)
+
+
+def _projector(z: int, x: int, y: int):
+    """lon/lat -> float tile coordinates (0..EXTENT inside the tile, y down)."""
+    n = 2 ** z
+
+    def project(lon: float, lat: float) -> tuple[float, float]:
+        wx = (lon + 180.0) / 360.0 * n
+        s = math.sin(math.radians(max(min(lat, 85.0511), -85.0511)))
+        wy = (0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)) * n
+        return (wx - x) * EXTENT, (wy - y) * EXTENT
+
+    return project
+
+
+def _simplify(pts: Sequence[tuple[float, float]], tol: float) -> list[tuple[float, float]]:
+    """Douglas-Peucker (iterative) on an open polyline."""
+    if len(pts) < 3 or tol <= 0:
+        return list(pts)
+    keep = [False] * len(pts)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(pts) - 1)]
+    tol2 = tol * tol
+    while stack:
+        i, j = stack.pop()
+        (x0, y0), (x1, y1) = pts[i], pts[j]
+        dx, dy = x1 - x0, y1 - y0
+        d2 = dx * dx + dy * dy
+        best, best_k = -1.0, -1
+        for k in range(i + 1, j):
+            px, py = pts[k]
+            if d2 == 0:
+                dist2 = (px - x0) ** 2 + (py - y0) ** 2
+            else:
+                dist2 = (dx * (y0 - py) - dy * (x0 - px)) ** 2 / d2
+            if dist2 > best:
+                best, best_k = dist2, k
+        if best > tol2:
+            keep[best_k] = True
+            stack += [(i, best_k), (best_k, j)]
+    return [p for p, k in zip(pts, keep) if k]
+
+
+def _polygon_feature(prop: Property, project, tol: float) -> mvt.Feature | None:
+    ring = [project(lon, lat) for lon, lat in prop.geom_polygon]
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring = ring[:-1]
+    # Simplify as a closed path: split at the vertex farthest from the first one
+    far = max(range(len(ring)), key=lambda i: (ring[i][0] - ring[0][0]) ** 2 + (ring[i][1] - ring[0][1]) ** 2)
+    ring = _simplify(ring[:far + 1], tol)[:-1] + _simplify(ring[far:] + ring[:1], tol)[:-1]
+
+    quantized: list[tuple[int, int]] = []
+    for px, py in ring:
+        q = (round(px), round(py))
+        if not quantized or quantized[-1] != q:
+            quantized.append(q)
+    if len(quantized) > 1 and quantized[0] == quantized[-1]:
+        quantized.pop()
+
+    attrs = {"id": prop.id, "title_number": prop.title_number, "area_m2": round(prop.area_m2 or 0.0, 1)}
+    if len(quantized) < 3 or mvt.ring_area(quantized) == 0:
+        # Smaller than a pixel at this zoom: keep it visible as a point
+        cx, cy = project(prop.centroid_lon, prop.centroid_lat)
+        return mvt.Feature(mvt.POINT, mvt.encode_point(round(cx), round(cy)), attrs, id=prop.id)
+    return mvt.Feature(mvt.POLYGON, mvt.encode_polygon([quantized]), attrs, id=prop.id)
+
+
+# ---------- per-user tiles ----------
+def user_tiles_version(db: Session, user_id: int) -> str:
+    """
+    Changes whenever any of the user's properties is added, removed or updated
+    (boundary replacement rewrites the stored geometry, which bumps updated_at).
+    """
+    count, last_update, last_id = db.execute(
+        select(func.count(Property.id), func.max(Property.updated_at), func.max(Property.id))
+        .where(Property.user_id == user_id)
+    ).one()
+    raw = f"{count}:{last_update}:{last_id}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def build_tile(db: Session, user_id: int, z: int, x: int, y: int) -> bytes:
+    west, south, east, north = tile_bounds(z, x, y, BUFFER)
+    props = db.execute(
+        select(Property)
+        .options(load_only(
+            Property.id, Property.title_number, Property.tie_point_id, Property.geom_polygon,
+            Property.centroid_lon, Property.centroid_lat, Property.area_m2,
+        ))
+        .where(Property.user_id == user_id, bbox_intersects(db.get_bind().dialect.name, west, south, east, north))
+        .order_by(Property.id)
+    ).scalars().all()
+
+    project = _projector(z, x, y)
+    tol = settings.tile_simplify_px * EXTENT / 256  # px on a 256-px tile -> tile units
+    parcels = mvt.Layer("properties", extent=EXTENT)
+    for prop in props:
+        feature = _polygon_feature(prop, project, tol)
+        if feature:
+            parcels.features.append(feature)
+
+    tie_layer = mvt.Layer("tie_points", extent=EXTENT)
+    tp_ids = select(Property.tie_point_id).where(Property.user_id == user_id).distinct()
+    for tp in db.execute(select(TiePoint).where(TiePoint.id.in_(tp_ids))).scalars():
+        lonlat = tie_point_lonlat(tp)
+        if lonlat is None or not (west <= lonlat[0] <= east and south <= lonlat[1] <= north):
+            continue
+        px, py = project(*lonlat)
+        tie_layer.features.append(mvt.Feature(
+            mvt.POINT, mvt.encode_point(round(px), round(py)),
+            {"id": tp.id, "name": tp.tie_point_name}, id=tp.id,
+        ))
+
+    return mvt.encode_tile([parcels, tie_layer])
+
+
+def get_tile(db: Session, user_id: int, z: int, x: int, y: int) -> tuple[bytes, str]:
+    """(tile bytes, version) from the per-user cache, building it on a miss."""
+    version = user_tiles_version(db, user_id)
+    key = (user_id, version, z, x, y)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+    if hit is not None:
+        return hit, version
+    data = build_tile(db, user_id, z, x, y)
+    with _CACHE_LOCK:
+        _CACHE[key] = data
+    return data, version
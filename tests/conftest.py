@@ -0,0 +1,109 @@
+"""
+Test fixtures: the app against a throwaway sqlite database.
+
+Settings are read at import time, so the environment is set up here before anything
+under `app` is imported.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+_TMP = tempfile.mkdtemp(prefix="landtracker-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_TMP}/test.db",
+    "LT_REPORTS_DIR": f"{_TMP}/reports",
+    "TITLE_IMG_DIR": f"{_TMP}/uploads/title_images",
+    "OUTBOX_ENABLED": "false",
+    "MAINTENANCE_INTERVAL_MINUTES": "0",
+    "PASSWORD_BCRYPT_ROUNDS": "4",
+    # Every request loads its principal: counts include that one lookup and don't depend on test order
+    "PRINCIPAL_CACHE_TTL_SECONDS": "0",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.security import create_access_token
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.tie_point import TiePoint
+from app.models.user import User
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:  # runs startup: tables, roles, first admin user
+        yield c
+
+
+@pytest.fixture(scope="session")
+def user_id(client) -> int:
+    with SessionLocal() as db:
+        return db.query(User).order_by(User.id).first().id
+
+
+@pytest.fixture(scope="session")
+def auth(user_id) -> dict:
+    return {"Authorization": "Bearer " + create_access_token(user_id, "admin")}
+
+
+@pytest.fixture(scope="session")
+def tie_point_id(client) -> int:
+    with SessionLocal() as db:
+        tp = TiePoint(tie_point_name="BLLM 1", northing=1600000.0, easting=500000.0)
+        db.add(tp)
+        db.commit()
+        return tp.id
+
+
+def boundary_rows(n: int) -> list[dict]:
+    return [{"bearing": "N 45° 30' E", "distance_m": 100.0}] + [
+        {"bearing": f"S {i} deg 10 min W", "distance_m": 50.0 + i} for i in range(n - 1)
+    ]
+
+
+@pytest.fixture
+def make_property(client, auth, user_id, tie_point_id):
+    """Create a property (with `boundaries` legs) through the API; returns its id."""
+    def _make(boundaries: int = 4) -> int:
+        r = client.post("/v1/properties", headers=auth, json={
+            "user_id": user_id, "title_number": "T-1", "owner": "Owner",
+            "technical_description": "td", "tie_point_id": tie_point_id,
+        })
+        assert r.status_code == 200, r.text
+        pid = r.json()["id"]
+        if boundaries:
+            r = client.put(f"/v1/properties/{pid}/boundaries", headers=auth, json=boundary_rows(boundaries))
+            assert r.status_code == 200, r.text
+        return pid
+    return _make
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __repr__(self) -> str:
+        return "\n".join(f"{i}: {s[:160]}" for i, s in enumerate(self.statements, 1))
+
+
+@pytest.fixture
+def count_queries():
+    """`with count_queries() as q: ...` -> q.count SQL statements sent to the database."""
+    @contextmanager
+    def _count():
+        counter = QueryCounter()
+        event.listen(engine, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", counter)
+    return _count
@@ -0,0 +1,73 @@
+import json
+
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.property_overlap import PropertyOverlap
+from app.models.tie_point import TiePoint
+from app.services.overlaps import _upsert_overlaps, refresh_overlaps
+from tests.conftest import boundary_rows
+
+
+def test_pair_stored_meanwhile_is_updated(make_property):
+    """The other side's check stored the pair between our delete and insert: no unique violation."""
+    a, b = make_property(), make_property()  # identical boundaries: they overlap fully
+    with SessionLocal() as db:
+        found = refresh_overlaps(db, a)
+        assert b in {o["other_property_id"] for o in found}
+
+        _upsert_overlaps(db, [
+            {"property_id": a, "other_property_id": b, "overlap_area_m2": 1.0, "overlap_ratio": 0.5},
+            {"property_id": b, "other_property_id": a, "overlap_area_m2": 1.0, "overlap_ratio": 0.25},
+        ])
+        db.commit()
+        rows = db.execute(
+            select(PropertyOverlap.property_id, PropertyOverlap.overlap_ratio)
+            .where(PropertyOverlap.property_id.in_([a, b]), PropertyOverlap.other_property_id.in_([a, b]))
+            .order_by(PropertyOverlap.property_id)
+        ).all()
+    assert [tuple(r) for r in rows] == [(a, 0.5), (b, 0.25)]
+
+
+def test_check_replaces_stored_pairs(client, auth, make_property):
+    a, b = make_property(), make_property()
+    for pid, other in ((a, b), (b, a), (a, b)):
+        r = client.post(f"/v1/properties/{pid}/overlaps/check", headers=auth)
+        assert r.status_code == 200
+        assert other in {o["other_property_id"] for o in r.json()}
+    with SessionLocal() as db:
+        n = db.query(PropertyOverlap).filter(
+            PropertyOverlap.property_id.in_([a, b]), PropertyOverlap.other_property_id.in_([a, b])
+        ).count()
+    assert n == 2
+
+
+def test_tie_point_move_refreshes_overlaps(client, auth, user_id):
+    """Parcels recomputed by a tie-point import get their overlaps rechecked (no PUT /boundaries involved)."""
+    with SessionLocal() as db:
+        tps = [TiePoint(tie_point_name=f"MOVE {i}", description="d", province="P", municipality="M",
+                        northing=1700000.0, easting=500000.0) for i in range(2)]
+        db.add_all(tps)
+        db.commit()
+        tp_ids = [tp.id for tp in tps]
+    a, b = (_property_on(client, auth, user_id, tp_id) for tp_id in tp_ids)
+    r = client.post(f"/v1/properties/{a}/overlaps/check", headers=auth)
+    assert b in {o["other_property_id"] for o in r.json()}
+
+    moved = [{"tie_point_name": "MOVE 1", "description": "d", "province": "P", "municipality": "M",
+              "northing": 1705000.0, "easting": 500000.0}]
+    r = client.post("/v1/tie-points/import", headers=auth,
+                    files={"file": ("t.json", json.dumps(moved), "application/json")})
+    assert r.status_code == 200 and r.json()["properties_recomputed"] == 1
+    assert client.get(f"/v1/properties/{a}/overlaps", headers=auth).json() == []
+    assert client.get(f"/v1/properties/{b}/overlaps", headers=auth).json() == []
+
+
+def _property_on(client, auth, user_id, tie_point_id) -> int:
+    r = client.post("/v1/properties", headers=auth, json={
+        "user_id": user_id, "title_number": "T-1", "owner": "Owner",
+        "technical_description": "td", "tie_point_id": tie_point_id,
+    })
+    pid = r.json()["id"]
+    assert client.put(f"/v1/properties/{pid}/boundaries", headers=auth, json=boundary_rows(4)).status_code == 200
+    return pid
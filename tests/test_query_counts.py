@@ -0,0 +1,258 @@
+"""
+SQL statements per request for the property and report endpoints (sqlite).
+
+Each count includes the one principal lookup of get_current_user (the cache is disabled
+in conftest). A relationship switched back to an eager lazy= strategy, or a load profile
+that stops covering what the response reads, shows up here as extra statements.
+"""
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from app.api.v1 import properties as properties_api
+from app.api.v1 import report_pdf as report_pdf_api
+from app.db.session import SessionLocal
+from app.models.property import Property
+from app.models.user import User
+
+PDF = b"%PDF-1.4\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n"
+
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), (200, 10, 10)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _data_url(mime: str, raw: bytes) -> str:
+    return f"data:{mime};base64," + base64.b64encode(raw).decode()
+
+
+@pytest.fixture
+def prop(make_property) -> int:
+    return make_property(boundaries=4)
+
+
+@pytest.fixture
+def prop_with_files(client, auth, prop):
+    """Property with one image and one report; returns (property_id, image_id, report_id)."""
+    r = client.post(f"/v1/properties/{prop}/images", headers=auth,
+                    json=[{"data_url": _data_url("image/png", _png()), "order_index": 0}])
+    assert r.status_code == 200, r.text
+    r = client.post(f"/v1/properties/{prop}/reports", headers=auth,
+                    json=[{"report_type": "survey", "data_url": _data_url("application/pdf", PDF)}])
+    assert r.status_code == 200, r.text
+    body = r.json()
+    return prop, body["images"][0]["id"], body["reports"][0]["id"]
+
+
+@pytest.fixture(scope="module")
+def foreign_prop(client, tie_point_id) -> int:
+    """A property owned by someone else (ownership checks must stop after the id/user_id lookup)."""
+    with SessionLocal() as db:
+        admin = db.query(User).order_by(User.id).first()
+        other = User(email="other@example.com", hashed_password="x", role_id=admin.role_id,
+                     is_active=True, is_verified=True)
+        db.add(other)
+        db.flush()
+        p = Property(user_id=other.id, title_number="X", owner="X", technical_description="td",
+                     tie_point_id=tie_point_id)
+        db.add(p)
+        db.commit()
+        return p.id
+
+
+@pytest.fixture(autouse=True)
+def _offline(monkeypatch):
+    """No overlap check after PUT /boundaries (own session, not the request's cost) and no Static Maps calls."""
+    monkeypatch.setattr(properties_api, "run_overlap_check", lambda property_id: None)
+
+    async def _snapshot(url: str) -> bytes:
+        return _png()
+    monkeypatch.setattr(report_pdf_api, "_fetch_image_bytes", _snapshot)
+
+
+def _expect(q, n):
+    assert q.count == n, f"expected {n} statements, got {q.count}:\n{q!r}"
+
+
+# ---------- app/api/v1/properties.py ----------
+def test_list_my(client, auth, make_property, count_queries):
+    make_property()
+    make_property()
+    with count_queries() as q:
+        assert client.get("/v1/properties/my", headers=auth).status_code == 200
+    _expect(q, 5)
+
+
+@pytest.mark.parametrize("include", [None, "geometry,images,boundaries,reports"])
+def test_page_my(client, auth, make_property, count_queries, include):
+    make_property()
+    make_property()
+    params = {"limit": 1, **({"include": include} if include else {})}
+    with count_queries() as q:
+        r = client.get("/v1/properties/my/page", headers=auth, params=params)
+    assert r.status_code == 200 and r.json()["next_cursor"]
+    _expect(q, 5 if include else 2)  # one selectin per included collection
+
+
+def test_in_bbox(client, auth, prop, count_queries):
+    with count_queries() as q:
+        r = client.get("/v1/properties/in-bbox", headers=auth, params={"bbox": "-180,-90,180,90"})
+    assert r.status_code == 200
+    _expect(q, 2)
+
+
+def test_export(client, auth, prop, count_queries):
+    with count_queries() as q:
+        r = client.get("/v1/properties/my/export", headers=auth, params={"format": "geojson"})
+    assert r.status_code == 200
+    _expect(q, 3)  # keyset batches: the last one comes back empty
+
+
+def test_get_property(client, auth, prop_with_files, count_queries):
+    pid, _, _ = prop_with_files
+    with count_queries() as q:
+        r = client.get(f"/v1/properties/{pid}", headers=auth)
+    assert r.status_code == 200 and r.json()["images"] and r.json()["reports"]
+    _expect(q, 5)
+
+
+def test_create_property(client, auth, user_id, tie_point_id, count_queries):
+    with count_queries() as q:
+        r = client.post("/v1/properties", headers=auth, json={
+            "user_id": user_id, "title_number": "T-2", "owner": "Owner",
+            "technical_description": "td", "tie_point_id": tie_point_id,
+        })
+    assert r.status_code == 200
+    _expect(q, 2)
+
+
+def test_replace_boundaries(client, auth, prop, count_queries):
+    rows = [{"bearing": "N 10 deg 00 min E", "distance_m": 20.0 + i} for i in range(4)]
+    with count_queries() as q:
+        r = client.put(f"/v1/properties/{prop}/boundaries", headers=auth, json=rows)
+    assert r.status_code == 200 and len(r.json()["boundaries"]) == 4
+    # sqlite can't batch INSERT..RETURNING in parameter order: one INSERT per boundary here (one on Postgres)
+    _expect(q, 10)
+
+
+def test_add_images(client, auth, prop, count_queries):
+    body = [{"data_url": _data_url("image/png", _png()), "order_index": i} for i in range(2)]
+    with count_queries() as q:
+        r = client.post(f"/v1/properties/{prop}/images", headers=auth, json=body)
+    assert r.status_code == 200 and len(r.json()["images"]) == 2
+    _expect(q, 7)
+
+
+def test_add_reports(client, auth, prop, count_queries):
+    body = [{"report_type": "survey", "data_url": _data_url("application/pdf", PDF)} for _ in range(2)]
+    with count_queries() as q:
+        r = client.post(f"/v1/properties/{prop}/reports", headers=auth, json=body)
+    assert r.status_code == 200 and len(r.json()["reports"]) == 2
+    _expect(q, 7)
+
+
+def test_upload_images(client, auth, prop, count_queries):
+    files = [("files", (f"{i}.png", _png(), "image/png")) for i in range(2)]
+    with count_queries() as q:
+        r = client.post(f"/v1/properties/{prop}/images/upload", headers=auth, files=files, data={"order_index": ["0", "1"]})
+    assert r.status_code == 200 and len(r.json()["images"]) == 2
+    _expect(q, 7)
+
+
+def test_upload_reports(client, auth, prop, count_queries):
+    files = [("files", (f"{i}.pdf", PDF, "application/pdf")) for i in range(2)]
+    with count_queries() as q:
+        r = client.post(f"/v1/properties/{prop}/reports/upload", headers=auth, files=files, data={"report_type": "survey"})
+    assert r.status_code == 200 and len(r.json()["reports"]) == 2
+    _expect(q, 7)
+
+
+def test_list_overlaps(client, auth, prop, count_queries):
+    with count_queries() as q:
+        assert client.get(f"/v1/properties/{prop}/overlaps", headers=auth).status_code == 200
+    _expect(q, 3)
+
+
+def test_check_overlaps(client, auth, prop, count_queries):
+    with count_queries() as q:
+        assert client.post(f"/v1/properties/{prop}/overlaps/check", headers=auth).status_code == 200
+    _expect(q, 6)
+
+
+def test_list_reports(client, auth, prop_with_files, count_queries):
+    pid, _, _ = prop_with_files
+    with count_queries() as q:
+        r = client.get(f"/v1/properties/{pid}/reports", headers=auth)
+    assert r.status_code == 200 and len(r.json()) == 1
+    _expect(q, 3)
+
+
+def test_download_report(client, auth, prop_with_files, count_queries):
+    pid, _, rid = prop_with_files
+    with count_queries() as q:
+        assert client.get(f"/v1/properties/{pid}/reports/{rid}/download", headers=auth).status_code == 200
+    _expect(q, 3)
+
+
+def test_download_report_not_owned(client, auth, prop_with_files, foreign_prop, count_queries):
+    _, _, rid = prop_with_files
+    with count_queries() as q:
+        r = client.get(f"/v1/properties/{foreign_prop}/reports/{rid}/download", headers=auth)
+    assert r.status_code == 403
+    _expect(q, 2)
+
+
+@pytest.mark.parametrize("variant", ["download", "thumbnail", "preview"])
+def test_image_endpoints(client, auth, prop_with_files, count_queries, variant):
+    pid, iid, _ = prop_with_files
+    with count_queries() as q:
+        assert client.get(f"/v1/properties/{pid}/images/{iid}/{variant}", headers=auth).status_code == 200
+    _expect(q, 3)
+
+
+# ---------- app/api/v1/report_pdf.py ----------
+def _report_body(pid: int) -> dict:
+    return {
+        "property_id": pid, "title_number": "T-1", "owner": "Owner",
+        "snapshot": "https://maps.googleapis.com/maps/api/staticmap?center=0,0",
+        "boundaries": [{"ns": "N", "deg": 45, "min": 30, "ew": "E", "distance": 100.0}],
+    }
+
+
+def test_report_pdf_miss_then_hit(client, auth, prop, count_queries):
+    with count_queries() as miss:
+        r = client.post("/v1/report_pdf", headers=auth, json=_report_body(prop))
+    assert r.status_code == 200 and r.headers["X-Report-Cache"] == "miss"
+    _expect(miss, 4)
+
+    with count_queries() as hit:
+        r = client.post("/v1/report_pdf", headers=auth, json=_report_body(prop))
+    assert r.status_code == 200 and r.headers["X-Report-Cache"] == "hit"
+    _expect(hit, 3)
+
+
+def test_report_pdf_not_owned(client, auth, foreign_prop, count_queries):
+    with count_queries() as q:
+        r = client.post("/v1/report_pdf", headers=auth, json=_report_body(foreign_prop))
+    assert r.status_code == 403
+    _expect(q, 2)
+
+
+@pytest.mark.parametrize("fmt", ["zip", "pdf"])
+def test_report_batch(client, auth, make_property, count_queries, fmt):
+    ids = [make_property(), make_property(), make_property()]
+    with count_queries() as miss:
+        r = client.post("/v1/report_pdf/batch", headers=auth, json={"property_ids": ids, "format": fmt})
+    assert r.status_code == 200
+    # principal, properties, boundaries, stored reports; then (zip stream / pdf background task)
+    # the recorded-rows check and one INSERT per new report (sqlite; batched on Postgres)
+    _expect(miss, 8)
+
+    with count_queries() as hit:
+        r = client.post("/v1/report_pdf/batch", headers=auth, json={"property_ids": ids, "format": fmt})
+    assert r.status_code == 200
+    _expect(hit, 4)
@@ -0,0 +1,39 @@
+import os
+
+from app.db.session import SessionLocal
+from app.models.property_report import PropertyReport
+
+
+def _reports(ids):
+    with SessionLocal() as db:
+        return db.query(PropertyReport).filter(PropertyReport.property_id.in_(ids)).all()
+
+
+def test_merged_pdf_is_not_recorded_as_each_report(client, auth, make_property):
+    ids = [make_property(), make_property()]
+    r = client.post("/v1/report_pdf/batch", headers=auth, json={"property_ids": ids, "format": "pdf"})
+    assert r.status_code == 200 and r.headers["X-Report-Path"] == ""
+    merged = r.content
+
+    rows = _reports(ids)
+    assert sorted(row.property_id for row in rows) == sorted(ids)
+    assert len({row.file_path for row in rows}) == len(ids)  # each property's own PDF
+    for row in rows:
+        with open(row.file_path, "rb") as f:
+            assert f.read() != merged
+
+    # Second run: served from the cache, no new rows
+    r = client.post("/v1/report_pdf/batch", headers=auth, json={"property_ids": ids, "format": "pdf"})
+    assert r.headers["X-Report-Cache"] == "hit" and r.content == merged
+    assert len(_reports(ids)) == len(ids)
+
+
+def test_zip_reuses_reports_stored_by_merged_batch(client, auth, make_property):
+    ids = [make_property(), make_property()]
+    client.post("/v1/report_pdf/batch", headers=auth, json={"property_ids": ids, "format": "pdf"})
+    stored = {row.property_id: row.file_path for row in _reports(ids)}
+
+    r = client.post("/v1/report_pdf/batch", headers=auth, json={"property_ids": ids, "format": "zip"})
+    assert r.status_code == 200
+    assert len(_reports(ids)) == len(ids)
+    assert all(os.path.exists(path) for path in stored.values())